@@ -5,7 +5,7 @@ from fastapi import status as http_status
 from fastapi.responses import JSONResponse
 from fastapi import APIRouter, Body, Depends, Path, Query
 
-from app.db.postgres import get_db
+from app.db.postgres import get_session
 
 from app.services.list_actions import Service
 from app.core.authorization import get_user_details
@@ -28,7 +28,7 @@ from app.models.list_actions import (
 router = APIRouter(prefix="/list-actions", tags=["List Actions"])
 
 
-def get_service(db: Session = Depends(get_db)) -> Service:
+def get_service(db: Session = Depends(get_session)) -> Service:
     """
     Dependency to provide a Service instance with a database session.
     Args:
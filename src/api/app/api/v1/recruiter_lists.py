@@ -10,7 +10,7 @@ from fastapi import status as http_status
 from fastapi.responses import JSONResponse
 from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query
 
-from app.db.postgres import get_db
+from app.db.postgres import get_session
 from app.core.authorization import get_user_details
 
 from app.repositories.recruiter_lists import Repository
@@ -24,7 +24,7 @@ from app.models.recruiter_lists import Request, Response, Status, NameRequest
 router = APIRouter(prefix="/recruiter-lists", tags=["Recruiter Lists"])
 
 
-def get_service(db: Session = Depends(get_db)) -> Service:
+def get_service(db: Session = Depends(get_session)) -> Service:
     """
     Dependency to provide a Service instance with a database session.
     """
@@ -1,17 +1,40 @@
+from time import monotonic
+from threading import Lock
+
 from sqlalchemy.orm import Session
 from fastapi import Depends, Header
 
-from app.db.postgres import get_db
+from app.core.config import config
+from app.db.postgres import get_session, session_scope
 from app.models.user_login import UserDetails
 from app.services.user_login import Service as UserService
 from app.repositories.user_login import Repository as UserRepository
 
+# Consumers resolve the same few recruiters for every event, so their details
+# are kept in-process for a short while; role changes apply after the TTL
+user_details_cache: dict[str, tuple[float, UserDetails]] = {}
+user_details_cache_lock = Lock()
+USER_DETAILS_CACHE_TTL = config["user_details_cache_ttl"]
+
 
 def get_user_details(
     x_user_id: str = Header(..., alias="X-User-ID"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> UserDetails:
     """Resolve the authenticated user's details using the X-User-ID header."""
     user_repo = UserRepository(db)
     user_service = UserService(user_repo)
     return user_service.get_user_details(user_id=x_user_id)
+
+
+def get_cached_user_details(user_id: str) -> UserDetails:
+    """Resolve a user's details, reusing a recent lookup for the same user_id."""
+    with user_details_cache_lock:
+        cached = user_details_cache.get(user_id)
+    if cached and monotonic() - cached[0] < USER_DETAILS_CACHE_TTL:
+        return cached[1]
+    with session_scope() as db:
+        user_details = get_user_details(x_user_id=user_id, db=db)
+    with user_details_cache_lock:
+        user_details_cache[user_id] = (monotonic(), user_details)
+    return user_details
@@ -1,5 +1,6 @@
 import json
 from pathlib import Path
+from contextlib import contextmanager
 from datetime import datetime
 
 from sqlalchemy import create_engine
@@ -8,16 +9,23 @@ from sqlalchemy.orm import sessionmaker
 from app.db import Base
 from app.core.config import config
 from app.models.user_login import Role
+from app.models.job_mandates import Model as JobMandateModel
 
 from app.schemas.schemas import ConfigsTable, UserLoginTable, JobMandates
 
-DATABASE_URL = f"postgresql+psycopg://{config['postgres']['user']}:{config['postgres']['password']}@{config['postgres']['host']}:{config['postgres']['port']}/{config['postgres']['database']}?sslmode=disable"
+DATABASE_URL = f"postgresql+psycopg://{config['postgres']['user']}:{config['postgres']['password']}@{config['postgres']['pgbouncer']['host']}:{config['postgres']['pgbouncer']['port']}/{config['postgres']['database']}?sslmode=disable"
 engine = create_engine(
     DATABASE_URL,
+    # PgBouncer in transaction mode hands each transaction a different server
+    # connection, so psycopg's automatic server-side prepares are off: ORM
+    # queries are still compiled once through SQLAlchemy's compiled cache, but
+    # Postgres parses and plans every execution
+    connect_args={"prepare_threshold": None},
     pool_size=config["postgres"]["pool_size"],
     max_overflow=config["postgres"]["max_overflow"],
     pool_timeout=config["postgres"]["pool_timeout"],
     pool_recycle=config["postgres"]["pool_recycle"],
+    pool_pre_ping=True,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -30,6 +38,23 @@ def get_db():
         db.close()
 
 
+def get_session():
+    """
+    FastAPI dependency yielding a pooled session that is closed, returning its
+    connection to the pool, once the request has been handled.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# get_session as a with-block for consumers and services outside FastAPI, so the
+# session is closed on every exit path
+session_scope = contextmanager(get_session)
+
+
 def create_configs():
     session = get_db()
     for recruiter in config["whatsapp"]:
@@ -82,6 +107,8 @@ def create_jobs():
     for item in data_dir.glob("*.json"):
         with open(item) as f:
             mandate = json.load(f)
+            # fail startup on a mandate the job flow could not validate later
+            JobMandateModel.model_validate(mandate)
             exists = (
                 session.query(JobMandates)
                 .filter(JobMandates.job_id == mandate["job_id"])
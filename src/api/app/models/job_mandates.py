@@ -83,6 +83,8 @@ class InterviewProcess(BaseModel):
 
 
 class JobInformation(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     title: str = Field(..., description="Job title")
     client: str = Field(..., description="Client name")
     location: str = Field(..., description="Job location")
@@ -123,6 +125,8 @@ class Answer(BaseModel):
 
 
 class QualifyingCriteria(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     id: str = Field(
         ..., description="The unique identifier for the qualifying criteria question"
     )
@@ -137,6 +141,8 @@ class QualifyingCriteria(BaseModel):
 
 
 class SubjectiveQuestions(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     id: str = Field(
         ..., description="The unique identifier for the subjective question"
     )
@@ -147,6 +153,8 @@ class SubjectiveQuestions(BaseModel):
 
 
 class MatchingFilters(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     job_id: int = Field(..., description="The unique identifier for the job")
     salary_max: int = Field(..., description="The maximum salary for the job")
     location: List[Location] = Field(..., description="List of job locations")
@@ -158,7 +166,8 @@ class MatchingFilters(BaseModel):
 
 
 class Model(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
+    # only the job flow validates mandates, so build validators on first use
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     id: Optional[int] = Field(
         None, description="The unique identifier for the job mandate"
@@ -1,9 +1,19 @@
 from enum import StrEnum
+from datetime import datetime
 from typing import Optional, Literal
 
+import shortuuid
 from pydantic import BaseModel, Field
 
 
+def event_timestamp() -> str:
+    """
+    Current time in the "%Y-%m-%dT%H:%M:%SZ" form events carry, rendered by
+    isoformat rather than re-parsing a strftime format on every event.
+    """
+    return datetime.now().isoformat(timespec="seconds") + "Z"
+
+
 class LanguageEnum(StrEnum):
     ENGLISH = "en-IN"
     HINDI = "hi-IN"
@@ -42,8 +52,10 @@ class SavedContactsModel(BaseModel):
 
 
 class Event(BaseModel):
-    mid: str = Field(..., description="Message ID")
-    timestamp: str = Field(..., description="The timestamp of the event")
+    mid: str = Field(default_factory=shortuuid.uuid, description="Message ID")
+    timestamp: str = Field(
+        default_factory=event_timestamp, description="The timestamp of the event"
+    )
     chat_id: str = Field(
         ...,
         description="The unique identifier for the chat",
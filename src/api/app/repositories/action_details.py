@@ -1,6 +1,7 @@
 from typing import List
 from datetime import datetime
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.models.action_details import Model, Status
@@ -37,6 +38,30 @@ class Repository:
         self.db.refresh(table)
         return table
 
+    def cancel_pending(self, action_id: int) -> List[Table]:
+        """
+        Cancel the action's details that have not finished yet.
+        :return: The cancelled rows.
+        """
+        statement = (
+            update(self.table)
+            .where(
+                self.table.action_id == action_id,
+                self.table.status.notin_(
+                    [Status.COMPLETED, Status.CANCELLED, Status.FAILED]
+                ),
+            )
+            .values(status=Status.CANCELLED, updated_at=datetime.now())
+            .returning(self.table)
+            .execution_options(populate_existing=True)
+        )
+        tables = list(self.db.scalars(statement))
+        # detach so the RETURNING values survive the commit's expiry
+        for table in tables:
+            self.db.expunge(table)
+        self.db.commit()
+        return tables
+
     def get_by_action_id(self, action_id: int) -> List[Table]:
         return self.db.query(self.table).filter(self.table.action_id == action_id).all()
 
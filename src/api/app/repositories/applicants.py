@@ -1,7 +1,9 @@
 from typing import List
 from datetime import datetime
 
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
 
 from app.core.logger import logger
 
@@ -45,6 +47,16 @@ class Repository:
             .first()
         )
 
+    def get_status(self, recruiter_id: int, applicant_id: int) -> str | None:
+        return (
+            self.db.query(self.table.status)
+            .filter(
+                self.table.recruiter_id == recruiter_id,
+                self.table.applicant_id == applicant_id,
+            )
+            .scalar()
+        )
+
     def get_by_recruiter_and_applicants(
         self, recruiter_id: int, applicant_ids: List[int]
     ) -> List[Table]:
@@ -113,7 +125,11 @@ class Repository:
                 .first()
             )
             logger.info(
-                f"[update_status] Status updated to {status} for applicant {applicant_id} by recruiter {recruiter_id}: {table.__dict__}"
+                "[update_status] Status updated to %s for applicant %s by recruiter %s: %s",
+                status,
+                applicant_id,
+                recruiter_id,
+                table.__dict__,
             )
         return table
 
@@ -171,7 +187,11 @@ class Repository:
             .first()
         )
         logger.info(
-            f"[update_response] Response updated to {response} for applicant {applicant_id} by recruiter {recruiter_id}: {table.__dict__}"
+            "[update_response] Response updated to %s for applicant %s by recruiter %s: %s",
+            response,
+            applicant_id,
+            recruiter_id,
+            table.__dict__,
         )
         return table
 
@@ -199,10 +219,54 @@ class Repository:
             .first()
         )
         logger.info(
-            f"[update_tags] Tags updated to {tags} for applicant {applicant_id} by recruiter {recruiter_id}: {table.__dict__}"
+            "[update_tags] Tags updated to %s for applicant %s by recruiter %s: %s",
+            tags,
+            applicant_id,
+            recruiter_id,
+            table.__dict__,
         )
         return table
 
+    def create_many(self, models: List[Model]) -> None:
+        statement = (
+            insert(self.table)
+            .values([model.model_dump(exclude={"id"}) for model in models])
+            .on_conflict_do_nothing(constraint="applicants_uk")
+        )
+        self.db.execute(statement)
+        self.db.commit()
+
+    def add_tag(self, recruiter_id: int, applicant_ids: List[int], tag: str) -> int:
+        # rows created without tags hold JSON null rather than SQL NULL, so
+        # anything that is not an array counts as no tags
+        tags = case(
+            (func.jsonb_typeof(self.table.tags) == "array", self.table.tags),
+            else_=func.jsonb_build_array(),
+        )
+        update = (
+            self.db.query(self.table)
+            .filter(
+                self.table.recruiter_id == recruiter_id,
+                self.table.applicant_id.in_(applicant_ids),
+                ~tags.has_key(tag),
+            )
+            .update(
+                {
+                    self.table.tags: tags.op("||")(func.jsonb_build_array(tag)),
+                    self.table.updated_at: datetime.now(),
+                },
+                synchronize_session=False,
+            )
+        )
+        self.db.commit()
+        logger.info(
+            "[add_tag] Tag %s added for %s applicants by recruiter %s",
+            tag,
+            update,
+            recruiter_id,
+        )
+        return update
+
     def update(self, recruiter_id: int, applicant_id: int, data: dict) -> Table:
         update = (
             self.db.query(self.table)
@@ -2,6 +2,7 @@ from typing import List
 from datetime import datetime
 
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
 
 from app.core.logger import logger
 
@@ -11,6 +12,20 @@ from app.models.utils import LanguageEnum
 from app.schemas.schemas import ConfigsTable as Table
 
 
+def ensure_config_cte(recruiter_id: int, applicant_id: int):
+    """
+    CTE inserting the configs row that other tables reference through their
+    (recruiter_id, applicant_id) foreign key, if it does not exist yet.
+    """
+    model = Model(recruiter_id=recruiter_id, applicant_id=applicant_id)  # type: ignore
+    return (
+        insert(Table)
+        .values(**model.model_dump(exclude={"id"}))
+        .on_conflict_do_nothing(constraint="configs_uk")
+        .cte("ensure_config")
+    )
+
+
 class Repository:
     def __init__(self, db: Session):
         self.db = db
@@ -24,6 +39,45 @@ class Repository:
         self.db.refresh(table)
         return table
 
+    def create_if_not_exists(self, model: Model) -> None:
+        statement = (
+            insert(self.table)
+            .values(**model.model_dump(exclude={"id"}))
+            .on_conflict_do_nothing(constraint="configs_uk")
+        )
+        self.db.execute(statement)
+        self.db.commit()
+
+    def create_many_if_not_exists(self, models: List[Model]) -> None:
+        statement = (
+            insert(self.table)
+            .values([model.model_dump(exclude={"id"}) for model in models])
+            .on_conflict_do_nothing(constraint="configs_uk")
+        )
+        self.db.execute(statement)
+        self.db.commit()
+
+    def disable_many(self, models: List[Model], updated_by: str) -> List[int]:
+        """
+        Insert the given configs disabled, or disable the existing enabled ones.
+        :return: The applicant ids whose config was inserted or disabled.
+        """
+        statement = insert(self.table).values(
+            [model.model_dump(exclude={"id"}) for model in models]
+        )
+        statement = statement.on_conflict_do_update(
+            constraint="configs_uk",
+            set_={
+                self.table.enabled: False,
+                self.table.updated_at: datetime.now(),
+                self.table.updated_by: updated_by,
+            },
+            where=self.table.enabled.is_(True),
+        ).returning(self.table.applicant_id)
+        applicant_ids = list(self.db.execute(statement).scalars())
+        self.db.commit()
+        return applicant_ids
+
     def get_all(self, id: int, admin: bool = False) -> List[Table]:
         query = self.db.query(self.table)
         if not admin:
@@ -103,7 +157,9 @@ class Repository:
             )
         return table
 
-    def update_counter(self, recruiter_id: int, applicant_id: int) -> Table:
+    def update_counter(
+        self, recruiter_id: int, applicant_id: int, count: int = 1
+    ) -> Table:
         table = (
             self.db.query(self.table)
             .filter(
@@ -122,7 +178,7 @@ class Repository:
                 )
                 .update(
                     {
-                        self.table.message_count: model.message_count + 1,
+                        self.table.message_count: model.message_count + count,
                         self.table.updated_at: datetime.now(),
                         self.table.updated_by: str(recruiter_id),
                     }
@@ -142,7 +198,10 @@ class Repository:
                     .first()
                 )
                 logger.info(
-                    f"[update_counter] Message count updated to {table.__dict__} for applicant {applicant_id} by recruiter {recruiter_id}"
+                    "[update_counter] Message count updated to %s for applicant %s by recruiter %s",
+                    table.__dict__,
+                    applicant_id,
+                    recruiter_id,
                 )
         return table
 
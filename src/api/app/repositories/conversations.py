@@ -1,11 +1,14 @@
 from typing import List
 from datetime import datetime
 
+from sqlalchemy import case, update, func, literal
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert, JSONB
 
 from app.core.logger import logger
 
 from app.models.conversations import Model, Conversation, Annotation
+from app.repositories.config import ensure_config_cte
 
 from app.schemas.schemas import ConversationsTable as Table
 
@@ -23,6 +26,66 @@ class Repository:
         self.db.refresh(table)
         return table
 
+    def create_if_not_exists(self, model: Model) -> Table | None:
+        statement = (
+            insert(self.table)
+            .add_cte(ensure_config_cte(model.recruiter_id, model.applicant_id))
+            .values(**model.model_dump(exclude={"id"}))
+            .on_conflict_do_nothing(constraint="conversations_uk")
+            .returning(self.table)
+        )
+        table = self.db.scalars(statement).first()
+        if table:
+            # detach so the RETURNING values survive the commit's expiry
+            self.db.expunge(table)
+        self.db.commit()
+        return table
+
+    def append_conversation(
+        self, recruiter_id: int, applicant_id: int, conversation: Conversation
+    ) -> Table:
+        return self.append_conversations(recruiter_id, applicant_id, [conversation])
+
+    def append_conversations(
+        self, recruiter_id: int, applicant_id: int, conversations: List[Conversation]
+    ) -> Table:
+        """
+        Appends to the conversation in one statement, creating the configs and
+        conversations rows on the first message.
+        """
+        now = datetime.now()
+        statement = (
+            insert(self.table)
+            .add_cte(ensure_config_cte(recruiter_id, applicant_id))
+            .values(
+                recruiter_id=recruiter_id,
+                applicant_id=applicant_id,
+                conversations=[
+                    conversation.model_dump(exclude_none=True)
+                    for conversation in conversations
+                ],
+                created_at=now,
+                updated_at=now,
+            )
+        )
+        statement = (
+            statement.on_conflict_do_update(
+                constraint="conversations_uk",
+                set_={
+                    "conversations": self.table.conversations.op("||")(
+                        statement.excluded.conversations
+                    ),
+                    "updated_at": now,
+                },
+            )
+            .returning(self.table)
+            .execution_options(populate_existing=True)
+        )
+        table = self.db.scalars(statement).one()
+        self.db.expunge(table)
+        self.db.commit()
+        return table
+
     def get_all(self, id: int, admin: bool = False) -> List[Table]:
         query = self.db.query(self.table)
         if not admin:
@@ -46,93 +109,70 @@ class Repository:
 
     def update_annotations(
         self, recruiter_id: int, applicant_id: int, annotation: Annotation
-    ) -> Table:
-        table = (
-            self.db.query(self.table)
-            .filter(
+    ) -> Table | None:
+        """
+        Appends the annotation server-side with JSONB `||`, without reading the
+        existing annotations back.
+        """
+        statement = (
+            update(self.table)
+            .where(
                 self.table.recruiter_id == recruiter_id,
                 self.table.applicant_id == applicant_id,
             )
-            .first()
+            .values(
+                # rows created without annotations hold JSON null rather than
+                # SQL NULL, so anything that is not an array counts as empty
+                annotations=case(
+                    (
+                        func.jsonb_typeof(self.table.annotations) == "array",
+                        self.table.annotations,
+                    ),
+                    else_=literal([], JSONB),
+                ).op("||")(literal([annotation.model_dump()], JSONB)),
+                updated_at=datetime.now(),
+            )
+            .returning(self.table)
+            .execution_options(populate_existing=True)
         )
+        table = self.db.scalars(statement).first()
         if table:
-            model = Model.model_validate(table)
-            annotations = model.annotations if model.annotations else []
-            annotations.append(annotation)
-            update = (
-                self.db.query(self.table)
-                .filter(
-                    self.table.recruiter_id == recruiter_id,
-                    self.table.applicant_id == applicant_id,
-                )
-                .update(
-                    {
-                        self.table.annotations: annotations,
-                        self.table.updated_at: datetime.now(),
-                    }
-                )
-            )
-            self.db.commit()
-            if update == 1:
-                logger.info(
-                    f"[update_annotations] Update annotations for applicant {applicant_id} by recruiter {recruiter_id}: {update}"
-                )
-                table = (
-                    self.db.query(self.table)
-                    .filter(
-                        self.table.recruiter_id == recruiter_id,
-                        self.table.applicant_id == applicant_id,
-                    )
-                    .first()
-                )
+            self.db.expunge(table)
+        self.db.commit()
+        logger.info(
+            f"[update_annotations] Update annotations for applicant {applicant_id} by recruiter {recruiter_id}: {table is not None}"
+        )
         return table
 
     def update_conversations(
         self, recruiter_id: int, applicant_id: int, conversation: Conversation
-    ) -> Table:
-        table = (
-            self.db.query(self.table)
-            .filter(
+    ) -> Table | None:
+        """
+        Appends the conversation server-side with JSONB `||`, without reading
+        the history back. Use append_conversation when the row may not exist.
+        """
+        statement = (
+            update(self.table)
+            .where(
                 self.table.recruiter_id == recruiter_id,
                 self.table.applicant_id == applicant_id,
             )
-            .first()
-        )
-        conversations = []
-        if table:
-            model = Model.model_validate(table)
-            conversations = model.conversations if model.conversations else []
-        conversations.append(conversation)
-        conversations = [conv.model_dump(exclude_none=True) for conv in conversations]
-        update = (
-            self.db.query(self.table)
-            .filter(
-                self.table.recruiter_id == recruiter_id,
-                self.table.applicant_id == applicant_id,
-            )
-            .update(
-                {
-                    self.table.conversations: conversations,
-                    self.table.updated_at: datetime.now(),
-                }
+            .values(
+                conversations=self.table.conversations.op("||")(
+                    [conversation.model_dump(exclude_none=True)]
+                ),
+                updated_at=datetime.now(),
             )
+            .returning(self.table)
+            .execution_options(populate_existing=True)
         )
+        table = self.db.scalars(statement).first()
+        if table:
+            self.db.expunge(table)
         self.db.commit()
         logger.info(
-            f"[update_conversations] Update conversations for applicant {applicant_id} by recruiter {recruiter_id}: {update}"
+            f"[update_conversations] Update conversations for applicant {applicant_id} by recruiter {recruiter_id}: {table is not None}"
         )
-        if update == 1:
-            table = (
-                self.db.query(self.table)
-                .filter(
-                    self.table.recruiter_id == recruiter_id,
-                    self.table.applicant_id == applicant_id,
-                )
-                .first()
-            )
-            logger.info(
-                f"[update_conversations] Conversations updated for applicant {applicant_id} by recruiter {recruiter_id}: {table.__dict__}"
-            )
         return table
 
     def close(self):
@@ -1,11 +1,14 @@
 from typing import List
 from datetime import datetime
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
 
 from app.core.logger import logger
 
 from app.models.documents import Model
+from app.repositories.config import ensure_config_cte
 
 from app.schemas.schemas import DocumentsTable as Table
 
@@ -23,6 +26,43 @@ class Repository:
         self.db.refresh(table)
         return table
 
+    def append_file_paths(
+        self, recruiter_id: int, applicant_id: int, file_paths: List[str]
+    ) -> Table:
+        """
+        Appends file paths in one statement, creating the configs and documents
+        rows for the applicant's first document.
+        """
+        now = datetime.now()
+        statement = (
+            insert(self.table)
+            .add_cte(ensure_config_cte(recruiter_id, applicant_id))
+            .values(
+                recruiter_id=recruiter_id,
+                applicant_id=applicant_id,
+                file_paths=file_paths,
+                created_at=now,
+                updated_at=now,
+            )
+        )
+        statement = (
+            statement.on_conflict_do_update(
+                constraint="documents_uk",
+                set_={
+                    "file_paths": self.table.file_paths.op("||")(
+                        statement.excluded.file_paths
+                    ),
+                    "updated_at": now,
+                },
+            )
+            .returning(self.table)
+            .execution_options(populate_existing=True)
+        )
+        table = self.db.scalars(statement).one()
+        self.db.expunge(table)
+        self.db.commit()
+        return table
+
     def get_all(self, id: int, admin: bool = False) -> List[Table]:
         query = self.db.query(self.table)
         if not admin:
@@ -46,47 +86,31 @@ class Repository:
 
     def update_document(
         self, recruiter_id: int, applicant_id: int, file_path: List[str]
-    ) -> Table:
-        table = (
-            self.db.query(self.table)
-            .filter(
+    ) -> Table | None:
+        """
+        Appends file paths server-side with JSONB `||`, without reading the
+        existing paths back.
+        """
+        statement = (
+            update(self.table)
+            .where(
                 self.table.recruiter_id == recruiter_id,
                 self.table.applicant_id == applicant_id,
             )
-            .first()
-        )
-        logger.info(
-            f"Updating document for recruiter {recruiter_id} and applicant {applicant_id}: {table.__dict__}"
+            .values(
+                file_paths=self.table.file_paths.op("||")(file_path),
+                updated_at=datetime.now(),
+            )
+            .returning(self.table)
+            .execution_options(populate_existing=True)
         )
+        table = self.db.scalars(statement).first()
         if table:
-            model = Model.model_validate(table)
-            file_paths = model.file_paths if model.file_paths else []
-            file_paths += file_path
-            update = (
-                self.db.query(self.table)
-                .filter(
-                    self.table.recruiter_id == recruiter_id,
-                    self.table.applicant_id == applicant_id,
-                )
-                .update(
-                    {
-                        self.table.file_paths: file_paths,
-                        self.table.updated_at: datetime.now(),
-                    }
-                )
-            )
-            self.db.commit()
-            if update == 1:
-                table = (
-                    self.db.query(self.table)
-                    .filter(
-                        self.table.recruiter_id == recruiter_id,
-                        self.table.applicant_id == applicant_id,
-                    )
-                    .first()
-                )
+            self.db.expunge(table)
+        self.db.commit()
         logger.info(
-            f"Document updated: {table.__dict__ if table else 'No document found'}"
+            "Document updated: %s",
+            table.__dict__ if table else "No document found",
         )
         return table
 
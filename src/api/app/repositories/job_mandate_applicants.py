@@ -1,6 +1,7 @@
 from typing import List
 from datetime import datetime
 
+from sqlalchemy import case
 from sqlalchemy.orm import Session
 
 from app.models.job_mandate_applicants import Model, Status
@@ -61,6 +62,24 @@ class Repository:
             .first()
         )
 
+    def get_latest_by_applicant_id(
+        self, applicant_id: int, statuses: List[Status]
+    ) -> Table:
+        # statuses earlier in the list win, then the best-ranked job within one
+        priority = case(
+            {status: index for index, status in enumerate(statuses)},
+            value=self.table.status,
+        )
+        return (
+            self.db.query(self.table)
+            .filter(
+                self.table.applicant_id == applicant_id,
+                self.table.status.in_(statuses),
+            )
+            .order_by(priority, self.table.rank.asc())
+            .first()
+        )
+
     def update(self, id: int, data: dict) -> int:
         result = (
             self.db.query(self.table)
@@ -1,7 +1,9 @@
 from typing import List
 from datetime import datetime
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
 
 from app.models.job_mandate_questions import Model, QuestionType
 
@@ -21,6 +23,19 @@ class Repository:
         self.db.refresh(table)
         return table
 
+    def create_if_not_exists(self, model: Model) -> Table | None:
+        statement = (
+            insert(self.table)
+            .values(**model.model_dump(exclude={"id"}))
+            .on_conflict_do_nothing(constraint="job_mandate_questions_uk")
+            .returning(self.table)
+        )
+        table = self.db.scalars(statement).first()
+        if table:
+            self.db.expunge(table)
+        self.db.commit()
+        return table
+
     def get(self, id: int) -> Table:
         return self.db.query(self.table).filter(self.table.id == id).first()
 
@@ -54,6 +69,19 @@ class Repository:
             .all()
         )
 
+    def count_by_question_type(
+        self, job_mandate_id: int, applicant_id: int, question_type: QuestionType
+    ) -> int:
+        return (
+            self.db.query(self.table)
+            .filter(
+                self.table.job_mandate_id == job_mandate_id,
+                self.table.applicant_id == applicant_id,
+                self.table.question_type == question_type,
+            )
+            .count()
+        )
+
     def get_by_id_status_type(
         self, applicant_id: int, job_id: int, status: bool, question_type: QuestionType
     ) -> Table:
@@ -70,29 +98,34 @@ class Repository:
 
     def update_status(
         self,
+        recruiter_id: int,
         job_mandate_id: int,
         applicant_id: int,
         question_id: str,
         status: bool,
         applicant_response: str,
-    ) -> int:
-        updated = (
-            self.db.query(self.table)
-            .filter(
+    ) -> Table | None:
+        statement = (
+            update(self.table)
+            .where(
+                self.table.recruiter_id == recruiter_id,
                 self.table.job_mandate_id == job_mandate_id,
                 self.table.applicant_id == applicant_id,
                 self.table.question_id == question_id,
             )
-            .update(
-                {
-                    self.table.status: status,
-                    self.table.applicant_response: applicant_response,
-                    self.table.updated_at: datetime.now(),
-                }
+            .values(
+                status=status,
+                applicant_response=applicant_response,
+                updated_at=datetime.now(),
             )
+            .returning(self.table)
         )
+        table = self.db.scalars(statement).first()
+        if table:
+            # detach so the RETURNING values survive the commit's expiry
+            self.db.expunge(table)
         self.db.commit()
-        return updated
+        return table
 
     def close(self):
         if self.db:
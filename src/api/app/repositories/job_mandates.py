@@ -1,5 +1,6 @@
 from typing import List
 
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
 from app.models.job_mandates import Status, Model
@@ -32,5 +33,22 @@ class Repository:
     def get_by_status(self, status: Status) -> List[Table]:
         return self.db.query(self.table).filter(self.table.status == status).all()
 
+    def get_matching_filters_by_status(self, status: Status) -> List[Row]:
+        """
+        Selects only what job matching needs: the job id, its filtering
+        criteria and the maximum monthly pay.
+        """
+        return (
+            self.db.query(
+                self.table.job_id,
+                self.table.filtering_criteria,
+                self.table.job_information[("benefits", "monthly_pay", "max")]
+                .as_integer()
+                .label("salary_max"),
+            )
+            .filter(self.table.status == status)
+            .all()
+        )
+
     def close(self):
         self.db.close()
@@ -1,15 +1,15 @@
 import json
+from typing import List
 from uuid import uuid4
 from datetime import datetime
 
-from shortuuid import uuid
+from pydantic import TypeAdapter
+from sqlalchemy.exc import IntegrityError
 from pydantic_core import ValidationError
 from fastapi import HTTPException, status as http_status
 
 from app.core.logger import logger
 
-from app.db.postgres import get_db
-
 from app.repositories.applicants import Repository
 from app.repositories.config import Repository as ConfigRepository
 
@@ -21,6 +21,10 @@ from app.models.applicants import Model, Request, Response, Status
 
 from app.services.util_service import send_message
 
+# Validates a whole result set in one pass through pydantic-core instead of
+# calling Model.model_validate once per row.
+MODELS_ADAPTER = TypeAdapter(list[Model])
+
 
 class Service:
     def __init__(self, repo: Repository):
@@ -42,29 +46,27 @@ class Service:
                 status_code=http_status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail=e.errors(),
             )
-        table = self.repo.get_by_recruiter_and_applicant(
-            model.recruiter_id, model.applicant_id
+        # configs row is required for the FK, applicants_uk guards duplicates
+        self.config_repo.create_if_not_exists(
+            Config(
+                recruiter_id=model.recruiter_id,
+                applicant_id=model.applicant_id,
+            )  # type: ignore
         )
-        if table:
-            logger.error(f"Applicant already exists: {table}")
+        try:
+            table = self.repo.create(model)
+        except IntegrityError as e:
+            self.repo.db.rollback()
+            if getattr(e.orig.diag, "constraint_name", None) != "applicants_uk":
+                raise
+            logger.error(
+                f"Applicant already exists: {model.recruiter_id}_{model.applicant_id}"
+            )
             raise HTTPException(
                 status_code=http_status.HTTP_409_CONFLICT,
                 detail="Applicant already exists",
             )
-        config = self.config_repo.get_by_recruiter_and_applicant(
-            model.recruiter_id, model.applicant_id
-        )
-        if not config:
-            logger.info(
-                f"Creating config for recruiter {model.recruiter_id} and applicant {model.applicant_id}"
-            )
-            config = Config(
-                recruiter_id=model.recruiter_id,
-                applicant_id=model.applicant_id,
-            )  # type: ignore
-            self.config_repo.create(config)
-        table = self.repo.create(model)
-        logger.info(f"Created applicant: {table.__dict__}")
+        logger.info("Created applicant: %s", table.__dict__)
         return Response(
             data=[Model.model_validate(table)],
             mid=uuid4(),
@@ -80,7 +82,7 @@ class Service:
             raise HTTPException(
                 status_code=http_status.HTTP_404_NOT_FOUND, detail="No lists found"
             )
-        data = [Model.model_validate(table) for table in tables]
+        data = MODELS_ADAPTER.validate_python(tables, from_attributes=True)
         return Response(
             data=data,
             mid=uuid4(),
@@ -146,7 +148,7 @@ class Service:
             raise HTTPException(
                 status_code=http_status.HTTP_404_NOT_FOUND, detail="No applicants found"
             )
-        models = [Model.model_validate(table) for table in tables]
+        models = MODELS_ADAPTER.validate_python(tables, from_attributes=True)
         return Response(
             data=models,
             mid=uuid4(),
@@ -156,14 +158,12 @@ class Service:
     def get_applicant_by_recruiter_and_applicant(
         self, user_details: UserDetails, applicant_id: int
     ) -> Model:
-        repo = Repository(get_db())
-        config_repo = ConfigRepository(get_db())
-        table = repo.get_applicant_by_recruiter_and_not_status(
+        table = self.repo.get_applicant_by_recruiter_and_not_status(
             user_details.id, applicant_id, status=Status.RETIRED
         )
         # If recruiter and applicant pair do not exist, check if applicant exists for other recruiters
         if not table:
-            table = repo.get_applicant_by_not_status(
+            table = self.repo.get_applicant_by_not_status(
                 applicant_id, status=Status.RETIRED
             )
             # if applicant does not exist for other recruiters
@@ -173,7 +173,7 @@ class Service:
                     applicant_id=applicant_id,
                 )  # type: ignore
                 # check config first for FK
-                config = config_repo.get_by_recruiter_and_applicant(
+                config = self.config_repo.get_by_recruiter_and_applicant(
                     user_details.id, applicant_id
                 )
                 if not config:
@@ -181,15 +181,15 @@ class Service:
                         recruiter_id=user_details.id,
                         applicant_id=applicant_id,
                     )  # type: ignore
-                    config = config_repo.create(config)
-                table = repo.create(model)
+                    config = self.config_repo.create(config)
+                table = self.repo.create(model)
             # if applicant exists for other recruiters
             else:
                 existing = Model.model_validate(table)
                 # if applicant exists for other recruiters in completed state,
                 # disable for new recruiter
                 if existing.status == Status.DETAILS_COMPLETED:
-                    config_repo.update_enabled(
+                    self.config_repo.update_enabled(
                         recruiter_id=user_details.id,
                         applicant_id=applicant_id,
                         enabled=False,
@@ -198,8 +198,6 @@ class Service:
                     if existing.details:
                         content = existing.details.model_dump(exclude_none=True)
                     event = Event(
-                        mid=uuid(),
-                        timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
                         chat_id=f"{user_details.id}@s.whatsapp.net",
                         receiver_id=user_details.id,
                         sender_id=user_details.id,
@@ -215,12 +213,12 @@ class Service:
                 else:
                     # if applicant exists for other recruiters in progress state,
                     # disable for old recruiter, copy existing details
-                    updated_existing = repo.update_status(
+                    updated_existing = self.repo.update_status(
                         recruiter_id=existing.recruiter_id,
                         applicant_id=existing.applicant_id,
                         status=Status.RETIRED,
                     )
-                    config_repo.update_enabled(
+                    self.config_repo.update_enabled(
                         recruiter_id=existing.recruiter_id,
                         applicant_id=applicant_id,
                         enabled=False,
@@ -228,9 +226,7 @@ class Service:
                     )
                     existing.id = None
                     existing.recruiter_id = user_details.id
-                    table = repo.create(existing)
-        repo.close()
-        config_repo.close()
+                    table = self.repo.create(existing)
         # send message with completion data to new recruiter
         model = Model.model_validate(table)
         return model
@@ -238,8 +234,7 @@ class Service:
     def update_details(
         self, user_details: UserDetails, applicant_id: int, details: dict
     ) -> Model:
-        repo = Repository(get_db())
-        table = repo.get_applicant_by_recruiter_and_not_status(
+        table = self.repo.get_applicant_by_recruiter_and_not_status(
             user_details.id, applicant_id, status=Status.RETIRED
         )
         if not table:
@@ -247,29 +242,26 @@ class Service:
                 status_code=http_status.HTTP_404_NOT_FOUND, detail="Applicant not found"
             )
         model = Model.model_validate(table)
-        existing_details = (
-            model.details.model_dump(exclude_none=True) if model.details else {}
-        )
-        for item in details:
-            existing_details[item] = details[item]
-        model.details = ApplicantDetails.model_validate(existing_details)
-        table = repo.update_details(
+        # details is dumped from an already validated ApplicantDetails
+        model.details = (model.details or ApplicantDetails()).model_copy(update=details)
+        table = self.repo.update_details(
             recruiter_id=user_details.id,
             applicant_id=applicant_id,
             details=model.details,
         )
-        repo.close()
         return Model.model_validate(table)
 
     def update_response(
-        self, user_details: UserDetails, applicant_id: int, response: str
+        self,
+        user_details: UserDetails,
+        applicant_id: int,
+        response: str,
+        count: int = 1,
     ) -> Model:
         logger.info(
             f"[update_response] Updating response for applicant {applicant_id} by recruiter {user_details.id}"
         )
-        repo = Repository(get_db())
-        config_repo = ConfigRepository(get_db())
-        table = repo.get_by_recruiter_and_applicant(
+        table = self.repo.get_by_recruiter_and_applicant(
             recruiter_id=user_details.id, applicant_id=applicant_id
         )
         if not table:
@@ -277,42 +269,41 @@ class Service:
             self.create(
                 user_details=user_details, body=Request(applicant_id=applicant_id)
             )
-        table = repo.update_response(
+        table = self.repo.update_response(
             recruiter_id=user_details.id, applicant_id=applicant_id, response=response
         )
-        repo.close()
-        config_repo.update_counter(
-            recruiter_id=user_details.id, applicant_id=applicant_id
+        # validate before the counter commit expires the shared session's rows
+        model = Model.model_validate(table)
+        self.config_repo.update_counter(
+            recruiter_id=user_details.id, applicant_id=applicant_id, count=count
         )
-        config_repo.close()
         logger.info(
             f"[update_response] Updated response and message count for applicant {applicant_id} by recruiter {user_details.id}"
         )
-        repo.close()
-        config_repo.close()
-        return Model.model_validate(table)
+        return model
 
     def update_status(
         self, user_details: UserDetails, applicant_id: int, status: Status
     ) -> Model:
-        repo = Repository(get_db())
         logger.info(
             f"[update_status] Updating status for applicant {applicant_id} by recruiter {user_details.id}"
         )
-        table = repo.update_status(
+        table = self.repo.update_status(
             recruiter_id=user_details.id, applicant_id=applicant_id, status=status
         )
         logger.info(
-            f"[update_status] Status updated to {status} for applicant {applicant_id} by recruiter {user_details.id}: {table.__dict__}"
+            "[update_status] Status updated to %s for applicant %s by recruiter %s: %s",
+            status,
+            applicant_id,
+            user_details.id,
+            table.__dict__,
         )
-        repo.close()
         return Model.model_validate(table)
 
     def update_tags(
         self, user_details: UserDetails, applicant_id: int, tags: list[str]
     ) -> Model:
-        repo = Repository(get_db())
-        table = repo.get_by_recruiter_and_applicant(
+        table = self.repo.get_by_recruiter_and_applicant(
             recruiter_id=user_details.id, applicant_id=applicant_id
         )
         if not table:
@@ -325,38 +316,75 @@ class Service:
         logger.info(
             f"Updating tags for applicant {applicant_id} by recruiter {user_details.id}: {updated_tags}"
         )
-        table = repo.update_tags(
+        table = self.repo.update_tags(
             recruiter_id=user_details.id, applicant_id=applicant_id, tags=updated_tags
         )
-        repo.close()
         return Model.model_validate(table)
 
+    def add_tag(
+        self, user_details: UserDetails, applicant_ids: List[int], tag: str
+    ) -> List[int]:
+        """
+        Tag the recruiter's applicants, creating the ones that do not exist yet,
+        with one query per step instead of one per applicant.
+        :return: The applicant ids that could not be created.
+        """
+        if not applicant_ids:
+            return []
+        existing = {
+            table.applicant_id
+            for table in self.repo.get_by_recruiter_and_applicants(
+                recruiter_id=user_details.id, applicant_ids=applicant_ids
+            )
+        }
+        if existing:
+            self.repo.add_tag(
+                recruiter_id=user_details.id, applicant_ids=list(existing), tag=tag
+            )
+        models = []
+        failed = []
+        for applicant_id in set(applicant_ids) - existing:
+            try:
+                models.append(
+                    Model(
+                        recruiter_id=user_details.id,
+                        applicant_id=applicant_id,
+                        tags=[tag],
+                    )  # type: ignore
+                )
+            except ValidationError as e:
+                logger.warning(
+                    "Applicant %s could not be created for recruiter %s: %s",
+                    applicant_id,
+                    user_details.id,
+                    e,
+                )
+                failed.append(applicant_id)
+        if models:
+            # configs rows are required for the FK
+            self.config_repo.create_many_if_not_exists(
+                [
+                    Config(
+                        recruiter_id=model.recruiter_id,
+                        applicant_id=model.applicant_id,
+                    )  # type: ignore
+                    for model in models
+                ]
+            )
+            self.repo.create_many(models)
+        return failed
+
     def get_applicant_status(
         self, user_details: UserDetails, applicant_id: int
     ) -> Status:
-        repo = Repository(get_db())
-        table = repo.get_by_recruiter_and_applicant(
+        # a non-retired row is a subset of this lookup, so one query suffices
+        status = self.repo.get_status(
             recruiter_id=user_details.id, applicant_id=applicant_id
         )
-        if not table:
-            table = repo.get_applicant_by_recruiter_and_not_status(
-                recruiter_id=user_details.id,
-                applicant_id=applicant_id,
-                status=Status.RETIRED,
-            )
-            repo.close()
-            if not table:
-                return Status.NOT_INITIATED
-            else:
-                model = Model.model_validate(table)
-                return model.status
-        else:
-            repo.close()
-            model = Model.model_validate(table)
-            return model.status
+        if not status:
+            return Status.NOT_INITIATED
+        return Status(status)
 
     def delete(self, applicant_id: int, recruiter_id: int) -> None:
-        repo = Repository(get_db())
         logger.info(f"[delete] Deleting applicant {applicant_id}")
-        repo.delete(recruiter_id=recruiter_id, applicant_id=applicant_id)
-        repo.close()
+        self.repo.delete(recruiter_id=recruiter_id, applicant_id=applicant_id)
@@ -2,7 +2,9 @@ import os
 import base64
 import requests
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 
+from app.core.config import config
 from app.core.logger import logger
 from app.models.utils import LanguageEnum
 from app.core.exception import MyException, ErrorMessages
@@ -13,6 +15,13 @@ class AudioService:
         self.sarvam_api_key = os.getenv("SARVAM_API_KEY")
         if not self.sarvam_api_key:
             raise ValueError("SARVAM_API_KEY environment variable is not set.")
+        # keeps TLS connections to the Sarvam API alive across calls, one per
+        # consumer dispatch worker
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(pool_maxsize=config["kafka"]["consumer"]["dispatch_workers"]),
+        )
 
     def sarvam_translate(self, byte_data: bytes) -> dict | None:
         """
@@ -25,7 +34,7 @@ class AudioService:
                 f"[sarvam_translate] Transcribing audio content for byte_data: {byte_data}"
             )
             audio_bytes = base64.b64decode(byte_data)
-            response = requests.post(
+            response = self.session.post(
                 "https://api.sarvam.ai/speech-to-text",
                 headers={
                     "api-subscription-key": os.getenv("SARVAM_API_KEY"),
@@ -58,7 +67,7 @@ class AudioService:
             logger.info(
                 f"[sarvam_tts] Generating audio for message: {message} in locale: {locale}"
             )
-            response = requests.post(
+            response = self.session.post(
                 "https://api.sarvam.ai/text-to-speech",
                 headers={
                     "api-subscription-key": os.getenv("SARVAM_API_KEY"),
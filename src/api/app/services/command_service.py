@@ -1,8 +1,6 @@
 import re
 from datetime import datetime
 
-import shortuuid
-
 from app.core.logger import logger
 from app.core.authorization import get_user_details
 from app.core.exception import MyException, ErrorMessages
@@ -12,7 +10,7 @@ from app.models.applicants import Model
 from app.models.utils import Commands, UpdatedBy, Event
 from app.models.user_login import UserDetails
 
-from app.db.postgres import get_db
+from app.db.postgres import session_scope
 
 from app.repositories.config import Repository as ConfigRepository
 from app.repositories.documents import Repository as DocumentRepository
@@ -26,6 +24,7 @@ from app.repositories.job_mandate_applicants import (
     Repository as JobMandateApplicantsRepository,
 )
 
+from app.services.util_service import send_message, pydantic_to_xlsx_bytes
 from app.services.configs import Service as ConfigService
 from app.services.documents import Service as DocumentService
 from app.services.applicants import Service as ApplicantService
@@ -73,37 +72,34 @@ class CommandService:
         """
         try:
             logger.info(f"[cmd_disable_chat] disabling chats for {event}")
-            from app.services.util_service import send_message
-
             pattern_number = r"\b(91\d{10})\b"
             pattern_contacts = r"\bcontacts\b"
             content = ""
-            if re.search(pattern_contacts, event["content"].lower()):
-                whatsmeow_contacts_repo = WhatsAppContactsRepository(get_db())
-                whatsmeow_contacts_service = WhatsAppContactsService(
-                    whatsmeow_contacts_repo
+            with session_scope() as db:
+                if re.search(pattern_contacts, event["content"].lower()):
+                    whatsmeow_contacts_service = WhatsAppContactsService(
+                        WhatsAppContactsRepository(db)
+                    )
+                    matches = whatsmeow_contacts_service.get_contacts(
+                        event["receiver_id"]
+                    )
+                else:
+                    matches = re.findall(pattern_number, event["content"])
+                content = CONTACTS_CHAT_DISABLE_SUCCESS.format(len(matches))
+                users = [
+                    Model(recruiter_id=event["receiver_id"], applicant_id=match)  # type: ignore
+                    for match in matches
+                ]
+                recruiter_id = users[0].recruiter_id
+                applicants = [user.applicant_id for user in users]
+                user_details = get_user_details(x_user_id=str(recruiter_id), db=db)
+                config_service = ConfigService(ConfigRepository(db))
+                config_service.update_enabled(
+                    user_details=user_details,
+                    applicant_ids=applicants,
+                    enabled=False,
+                    updated_by=UpdatedBy.USER,
                 )
-                matches = whatsmeow_contacts_service.get_contacts(event["receiver_id"])
-                whatsmeow_contacts_repo.close()
-            else:
-                matches = re.findall(pattern_number, event["content"])
-            content = CONTACTS_CHAT_DISABLE_SUCCESS.format(len(matches))
-            users = [
-                Model(recruiter_id=event["receiver_id"], applicant_id=match)  # type: ignore
-                for match in matches
-            ]
-            recruiter_id = users[0].recruiter_id
-            applicants = [user.applicant_id for user in users]
-            user_details = get_user_details(x_user_id=str(recruiter_id), db=get_db())
-            config_repo = ConfigRepository(get_db())
-            config_service = ConfigService(config_repo)
-            config_service.update_enabled(
-                user_details=user_details,
-                applicant_ids=applicants,
-                enabled=False,
-                updated_by=UpdatedBy.USER,
-            )
-            config_repo.close()
             logger.info(f"[cmd_disable_chat] disable chat for {event} successfull.")
             response_event = Event(
                 chat_id=event["chat_id"],
@@ -111,8 +107,6 @@ class CommandService:
                 msg_type="text",
                 receiver_id=recruiter_id,
                 sender_id=recruiter_id,
-                timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                mid=shortuuid.uuid(),
             )
             send_message(
                 user_details=user_details,
@@ -142,18 +136,16 @@ class CommandService:
         """
         try:
             logger.info(f"[export_recruiter_report] ")
-            from app.services.util_service import send_message, pydantic_to_xlsx_bytes
-
-            user_details = get_user_details(x_user_id=event["receiver_id"], db=get_db())
-            applicant_repo = ApplicantRepository(get_db())
-            applicant_service = ApplicantService(applicant_repo)
-            response = applicant_service.get_all(user_details=user_details)
-            applicant_repo.close()
+            with session_scope() as db:
+                user_details = get_user_details(x_user_id=event["receiver_id"], db=db)
+                applicant_service = ApplicantService(ApplicantRepository(db))
+                response = applicant_service.get_all(user_details=user_details)
+                # the upload below only talks to blob storage, so the session
+                # is released before it starts
+                document_service = DocumentService(DocumentRepository(db))
             users = response.data
             if users:
                 users_bytes = pydantic_to_xlsx_bytes(users)
-                document_repo = DocumentRepository(get_db())
-                document_service = DocumentService(document_repo)
                 blob_url = document_service.azure_upload_file(
                     {
                         "content": users_bytes,
@@ -162,15 +154,12 @@ class CommandService:
                     },
                     return_url=True,
                 )
-                document_repo.close()
                 response_event = Event(
                     chat_id=event["chat_id"],
                     content=str(blob_url),
                     msg_type="text",
                     receiver_id=user_details.id,
                     sender_id=user_details.id,
-                    timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    mid=shortuuid.uuid(),
                 )
                 send_message(
                     user_details=user_details,
@@ -193,62 +182,34 @@ class CommandService:
             )
 
     def reset_applicant(self, user_details: UserDetails, event: dict):
-        from app.services.util_service import send_message
-
         recruiter_id = int(event["receiver_id"])
         applicant_id = int(event["sender_id"])
 
-        applicant_repo = ApplicantRepository(get_db())
-        applicant_service = ApplicantService(applicant_repo)
-        applicant_service.delete(
-            recruiter_id=recruiter_id,
-            applicant_id=applicant_id,
-        )
-        applicant_repo.close()
-
-        conversation_repo = ConversationRepository(get_db())
-        conversation_service = ConversationService(conversation_repo)
-        conversation_service.delete(
-            recruiter_id=recruiter_id,
-            applicant_id=applicant_id,
-        )
-        conversation_repo.close()
-
-        documents_repo = DocumentRepository(get_db())
-        documents_service = DocumentService(documents_repo)
-        documents_service.delete(
-            recruiter_id=recruiter_id,
-            applicant_id=applicant_id,
-        )
-        documents_repo.close()
-
-        job_mandate_questions_repo = JobMandateQuestionsRepository(get_db())
-        job_mandate_questions_service = JobMandateQuestionsService(
-            job_mandate_questions_repo
-        )
-        job_mandate_questions_service.delete(
-            recruiter_id=recruiter_id,
-            applicant_id=applicant_id,
-        )
-        job_mandate_questions_repo.close()
-
-        job_mandate_applicants_repo = JobMandateApplicantsRepository(get_db())
-        job_mandate_applicants_service = JobMandateApplicantsService(
-            job_mandate_applicants_repo
-        )
-        job_mandate_applicants_service.delete(
-            recruiter_id=recruiter_id,
-            applicant_id=applicant_id,
-        )
-        job_mandate_applicants_repo.close()
-
-        config_repo = ConfigRepository(get_db())
-        config_service = ConfigService(config_repo)
-        config_service.delete(
-            recruiter_id=recruiter_id,
-            applicant_id=applicant_id,
-        )
-        config_repo.close()
+        with session_scope() as db:
+            ApplicantService(ApplicantRepository(db)).delete(
+                recruiter_id=recruiter_id,
+                applicant_id=applicant_id,
+            )
+            ConversationService(ConversationRepository(db)).delete(
+                recruiter_id=recruiter_id,
+                applicant_id=applicant_id,
+            )
+            DocumentService(DocumentRepository(db)).delete(
+                recruiter_id=recruiter_id,
+                applicant_id=applicant_id,
+            )
+            JobMandateQuestionsService(JobMandateQuestionsRepository(db)).delete(
+                recruiter_id=recruiter_id,
+                applicant_id=applicant_id,
+            )
+            JobMandateApplicantsService(JobMandateApplicantsRepository(db)).delete(
+                recruiter_id=recruiter_id,
+                applicant_id=applicant_id,
+            )
+            ConfigService(ConfigRepository(db)).delete(
+                recruiter_id=recruiter_id,
+                applicant_id=applicant_id,
+            )
 
 
 command_service = CommandService()
@@ -2,10 +2,10 @@ from uuid import uuid4
 from typing import List
 from datetime import datetime
 
+from pydantic import TypeAdapter
 from fastapi import HTTPException, status as http_status
 
 from app.core.logger import logger
-from app.db.postgres import get_db
 
 from app.repositories.config import Repository
 
@@ -13,6 +13,8 @@ from app.models.utils import UpdatedBy
 from app.models.user_login import UserDetails, Role
 from app.models.configs import Model, Request, Response
 
+MODELS_ADAPTER = TypeAdapter(list[Model])
+
 
 class Service:
     def __init__(self, repo: Repository):
@@ -47,7 +49,7 @@ class Service:
             raise HTTPException(
                 status_code=http_status.HTTP_404_NOT_FOUND, detail="No lists found"
             )
-        data = [Model.model_validate(table) for table in tables]
+        data = MODELS_ADAPTER.validate_python(tables, from_attributes=True)
         return Response(
             data=data,
             mid=uuid4(),
@@ -97,7 +99,6 @@ class Service:
         enabled: bool,
         updated_by: UpdatedBy,
     ) -> List[Model]:
-        repo = Repository(get_db())
         updated = (
             str(user_details.id)
             if updated_by == UpdatedBy.USER
@@ -105,7 +106,9 @@ class Service:
         )
         updates = []
         for applicant_id in applicant_ids:
-            table = repo.get_by_recruiter_and_applicant(user_details.id, applicant_id)
+            table = self.repo.get_by_recruiter_and_applicant(
+                user_details.id, applicant_id
+            )
             if not table:
                 model = Model(
                     recruiter_id=user_details.id,
@@ -113,19 +116,16 @@ class Service:
                     enabled=enabled,
                     updated_by=updated,
                 )  # type: ignore
-                table = repo.create(model)
-            table = repo.update_enabled(
+                table = self.repo.create(model)
+            table = self.repo.update_enabled(
                 recruiter_id=user_details.id,
                 applicant_id=applicant_id,
                 enabled=enabled,
                 updated_by=updated,
             )
             updates.append(Model.model_validate(table))
-        repo.close()
         return updates
 
     def delete(self, applicant_id: int, recruiter_id: int) -> None:
-        repo = Repository(get_db())
         logger.info(f"[delete] Deleting applicant {applicant_id}")
-        repo.delete(recruiter_id=recruiter_id, applicant_id=applicant_id)
-        repo.close()
+        self.repo.delete(recruiter_id=recruiter_id, applicant_id=applicant_id)
@@ -2,20 +2,20 @@ from uuid import uuid4
 from typing import List
 from datetime import datetime
 
+from pydantic import TypeAdapter
 from fastapi import HTTPException, status as http_status
 
 from app.core.logger import logger
 
-from app.db.postgres import get_db
-
 from app.repositories.conversations import Repository
 from app.repositories.config import Repository as ConfigRepository
 
 from app.models.utils import Event
-from app.models.configs import Model as Config
 from app.models.user_login import UserDetails, Role
 from app.models.conversations import Model, Request, Response, Conversation
 
+MODELS_ADAPTER = TypeAdapter(list[Model])
+
 
 class Service:
     def __init__(self, repo: Repository):
@@ -23,23 +23,18 @@ class Service:
         self.config_repo = ConfigRepository(self.repo.db)
 
     def create(self, user_details: UserDetails, body: Request) -> Response:
-        conversations = [
-            Conversation.model_validate(conv) for conv in (body.conversations or [])
-        ]
+        # body.conversations was already validated as List[Conversation]
         model = Model(
             recruiter_id=user_details.id,
             applicant_id=body.applicant_id,
-            conversations=conversations,
+            conversations=body.conversations or [],
         )  # type: ignore
-        table = self.repo.get_by_recruiter_and_applicant(
-            model.recruiter_id, model.applicant_id
-        )
-        if table:
+        table = self.repo.create_if_not_exists(model)
+        if not table:
             raise HTTPException(
                 status_code=http_status.HTTP_409_CONFLICT,
                 detail="Conversation already exists",
             )
-        table = self.repo.create(model)
         return Response(
             data=[Model.model_validate(table)],
             mid=uuid4(),
@@ -55,7 +50,7 @@ class Service:
             raise HTTPException(
                 status_code=http_status.HTTP_404_NOT_FOUND, detail="No lists found"
             )
-        data = [Model.model_validate(table) for table in tables]
+        data = MODELS_ADAPTER.validate_python(tables, from_attributes=True)
         return Response(
             data=data,
             mid=uuid4(),
@@ -101,49 +96,31 @@ class Service:
     def update_conversation(
         self, user_details: UserDetails, applicant_id: int, event: Event, role: Role
     ) -> Model:
-        repo = Repository(get_db())
-        config_repo = ConfigRepository(repo.db)
-        conversation = Conversation(
-            sender_id=event.sender_id,
-            content=event.content,  # type: ignore
-            role=role,
-            ts=event.timestamp,
-            mid=event.mid,
-            msg_type=event.msg_type,  # type: ignore
-        )
-        table = repo.get_by_recruiter_and_applicant(user_details.id, applicant_id)
-        if not table:
-            # check config first for FK
-            config = config_repo.get_by_recruiter_and_applicant(
-                user_details.id, applicant_id
-            )
-            if not config:
-                config = Config(
-                    recruiter_id=user_details.id,
-                    applicant_id=applicant_id,
-                )  # type: ignore
-                config = config_repo.create(config)
-            table = repo.create(
-                Model(
-                    recruiter_id=user_details.id,
-                    applicant_id=applicant_id,
-                    conversations=[conversation],
-                )  # type: ignore
-            )
-        else:
-            model = Model.model_validate(table)
-            if model.recruiter_id != user_details.id:
-                raise HTTPException(
-                    status_code=http_status.HTTP_401_UNAUTHORIZED,
-                    detail="Not authorized",
-                )
-            table = repo.update_conversations(
-                recruiter_id=user_details.id,
-                applicant_id=applicant_id,
-                conversation=conversation,
+        return self.update_conversations(user_details, applicant_id, [event], role)
+
+    def update_conversations(
+        self,
+        user_details: UserDetails,
+        applicant_id: int,
+        events: List[Event],
+        role: Role,
+    ) -> Model:
+        conversations = [
+            Conversation(
+                sender_id=event.sender_id,
+                content=event.content,  # type: ignore
+                role=role,
+                ts=event.timestamp,
+                mid=event.mid,
+                msg_type=event.msg_type,  # type: ignore
             )
-        repo.close()
-        config_repo.close()
+            for event in events
+        ]
+        table = self.repo.append_conversations(
+            recruiter_id=user_details.id,
+            applicant_id=applicant_id,
+            conversations=conversations,
+        )
         logger.info(
             f"[update_conversation] Updated conversation for applicant {applicant_id} by recruiter {user_details.id}"
         )
@@ -152,35 +129,21 @@ class Service:
     def get_history(
         self, user_details: UserDetails, applicant_id: int
     ) -> List[Conversation]:
-        repo = Repository(get_db())
-        config_repo = ConfigRepository(repo.db)
-        table = repo.get_by_recruiter_and_applicant(user_details.id, applicant_id)
+        table = self.repo.get_by_recruiter_and_applicant(user_details.id, applicant_id)
         if not table:
-            config = config_repo.get_by_recruiter_and_applicant(
-                user_details.id, applicant_id
-            )
-            if not config:
-                config = Config(
-                    recruiter_id=user_details.id,
-                    applicant_id=applicant_id,
-                )  # type: ignore
-                config = config_repo.create(config)
-            table = repo.create(
+            # creates the configs row as well, None if a concurrent call won
+            table = self.repo.create_if_not_exists(
                 Model(
                     recruiter_id=user_details.id,
                     applicant_id=applicant_id,
                     conversations=[],
                 )  # type: ignore
-            )
-        repo.close()
-        config_repo.close()
+            ) or self.repo.get_by_recruiter_and_applicant(user_details.id, applicant_id)
         model = Model.model_validate(table)
         if model.conversations:
             return model.conversations
         return []
 
     def delete(self, applicant_id: int, recruiter_id: int) -> None:
-        repo = Repository(get_db())
         logger.info(f"[delete] Deleting applicant {applicant_id}")
-        repo.delete(recruiter_id=recruiter_id, applicant_id=applicant_id)
-        repo.close()
+        self.repo.delete(recruiter_id=recruiter_id, applicant_id=applicant_id)
@@ -1,14 +1,17 @@
 import os
 import base64
 from uuid import uuid4
+from functools import lru_cache
 from datetime import datetime, timedelta
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
-import shortuuid
+from pydantic import TypeAdapter
 from fastapi import HTTPException, status as http_status
 from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPermissions
 
-from app.db.postgres import get_db
+from app.db.postgres import session_scope
 
 from app.core.logger import logger
 from app.core.config import config
@@ -20,7 +23,6 @@ from app.core.constants import DOCUMENT_SAVED, INTRODUCTION_MESSAGE
 from app.repositories.applicants import Repository as ApplicantRepository
 
 from app.models.utils import Event
-from app.models.configs import Model as Config
 from app.models.user_login import UserDetails, Role
 from app.models.applicants import Status as ApplicantStatus
 from app.models.documents import Model, Request, Response, Document
@@ -29,6 +31,92 @@ from app.services.util_service import send_message
 from app.services.applicants import Service as ApplicantService
 from app.services.job_service import job_service
 
+AZURE_ACCOUNT_NAME = os.getenv("AZURE_ACCOUNT_NAME", "")
+AZURE_ACCOUNT_KEY = os.getenv("AZURE_ACCOUNT_KEY", "")
+AZURE_CONTAINER_NAME = os.getenv("AZURE_CONTAINER_NAME", "")
+AZURE_ACCOUNT_URL = f"https://{AZURE_ACCOUNT_NAME}.blob.core.windows.net/"
+AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
+AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+AWS_REGION = os.getenv("AWS_REGION")
+
+# SAS tokens live 5 minutes; one is handed out again while 1 minute remains
+SAS_TTL = timedelta(minutes=5)
+SAS_REUSE = timedelta(minutes=4)
+sas_cache: dict[str, tuple[str, datetime]] = {}
+sas_cache_lock = Lock()
+
+ALLOWED_EXTENSIONS = frozenset({"pdf", "docx", "txt", "csv", "xlsx"})
+
+# Runs DB lookups that do not depend on the blob upload alongside it
+lookup_executor = ThreadPoolExecutor(max_workers=4)
+
+MODELS_ADAPTER = TypeAdapter(list[Model])
+
+
+def get_applicant_status(
+    user_details: UserDetails, applicant_id: int
+) -> ApplicantStatus:
+    """
+    Applicant status lookup for lookup_executor. It runs on another thread, so
+    it opens a session of its own, closed however the caller's work ends.
+    """
+    with session_scope() as db:
+        return ApplicantService(ApplicantRepository(db)).get_applicant_status(
+            user_details=user_details, applicant_id=applicant_id
+        )
+
+
+@lru_cache(maxsize=1)
+def get_blob_service_client() -> BlobServiceClient:
+    """
+    Shared Azure client so uploads reuse its pooled HTTPS connections.
+    """
+    return BlobServiceClient(
+        account_url=AZURE_ACCOUNT_URL, credential=AZURE_ACCOUNT_KEY
+    )
+
+
+def get_blob_sas(blob_name: str) -> str:
+    """
+    Returns a read-only SAS token for the blob, reusing a recently signed one.
+    """
+    now = datetime.now()
+    with sas_cache_lock:
+        cached = sas_cache.get(blob_name)
+        if cached and now - cached[1] < SAS_REUSE:
+            return cached[0]
+        token = generate_blob_sas(
+            account_name=AZURE_ACCOUNT_NAME,
+            container_name=AZURE_CONTAINER_NAME,
+            blob_name=blob_name,
+            account_key=AZURE_ACCOUNT_KEY,
+            expiry=now + SAS_TTL,
+            permission=BlobSasPermissions(read=True),
+        )
+        # re-inserting keeps the dict in signing order, so expired tokens
+        # are always at its front and are evicted from there
+        sas_cache.pop(blob_name, None)
+        sas_cache[blob_name] = (token, now)
+        while True:
+            oldest = next(iter(sas_cache))
+            if now - sas_cache[oldest][1] < SAS_REUSE:
+                break
+            del sas_cache[oldest]
+        return token
+
+
+@lru_cache(maxsize=1)
+def get_s3_client():
+    """
+    Shared S3 client so uploads reuse its pooled HTTPS connections.
+    """
+    return boto3.client(
+        "s3",
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+        region_name=AWS_REGION,
+    )
+
 
 class Service:
     def __init__(self, repo: Repository):
@@ -57,7 +145,7 @@ class Service:
         return Response(
             mid=uuid4(),
             ts=datetime.now(),
-            data=[Model.model_validate(doc) for doc in documents],
+            data=MODELS_ADAPTER.validate_python(documents, from_attributes=True),
         )
 
     def get(self, user_details: UserDetails, id: int) -> Response:
@@ -105,6 +193,10 @@ class Service:
             applicant_id=body.request.applicant_id,
             file_path=body.request.file_paths,
         )
+        if not table:
+            raise HTTPException(
+                status_code=http_status.HTTP_404_NOT_FOUND, detail="Documents not found"
+            )
         model = Model.model_validate(table)
         if model.recruiter_id != user_details.id and user_details.role != Role.ADMIN:  # type: ignore
             raise HTTPException(
@@ -114,62 +206,45 @@ class Service:
         return Response(data=[model], mid=uuid4(), ts=datetime.now())
 
     def create_or_update(self, user_details: UserDetails, body: Document) -> Model:
-        repo = Repository(get_db())
-        config_repo = ConfigRepository(get_db())
-        applicant_id = body.applicant_id
-        table = repo.get_by_recruiter_and_applicant(user_details.id, applicant_id)
         logger.info(
-            f"Checking document for recruiter {user_details.id} and applicant {applicant_id}"
+            f"Saving document for recruiter {user_details.id} and applicant {body.applicant_id}"
+        )
+        table = self.repo.append_file_paths(
+            recruiter_id=user_details.id,
+            applicant_id=body.applicant_id,
+            file_paths=body.file_paths,
         )
-        if not table:
-            config = config_repo.get_by_recruiter_and_applicant(
-                user_details.id, applicant_id
-            )
-            logger.info(f"Config found: {config}")
-            if not config:
-                config = Config(
-                    recruiter_id=user_details.id,
-                    applicant_id=applicant_id,
-                )  # type: ignore
-                config = config_repo.create(config)
-            model = Model(
-                recruiter_id=user_details.id,
-                applicant_id=body.applicant_id,
-                file_paths=body.file_paths,
-            )
-            table = repo.create(model)
-        else:
-            logger.info(
-                f"Document found for recruiter {user_details.id} and applicant {applicant_id}"
-            )
-            table = repo.update_document(
-                recruiter_id=user_details.id,
-                applicant_id=body.applicant_id,
-                file_path=body.file_paths,
-            )
-        logger.info(f"Document updated or created: {table.__dict__}")
         model = Model.model_validate(table)
-        logger.info(f"Document found or created: {model}")
         if model.recruiter_id != user_details.id and user_details.role != Role.ADMIN:  # type: ignore
             raise HTTPException(
                 status_code=http_status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to access this document",
             )
-        logger.info(f"Document created/updated successfully: {model}")
-        repo.close()
-        config_repo.close()
+        logger.info("Document created/updated successfully: %s", model)
         return model
 
     def process_document(self, event: Event) -> Model:
-        user_details = get_user_details(x_user_id=str(event.receiver_id), db=get_db())
-        file_extension = event.mime_type.split("/")[1]  # type: ignore
-        if file_extension not in ["pdf", "docx", "txt", "csv", "xlsx"]:
+        user_details = get_user_details(
+            x_user_id=str(event.receiver_id), db=self.repo.db
+        )
+        # the MIME subtype, checked against the extensions exactly as before
+        mime_parts = (event.mime_type or "").split("/")
+        file_extension = mime_parts[1] if len(mime_parts) > 1 else ""
+        if file_extension not in ALLOWED_EXTENSIONS:
             raise ValueError(
                 f"Unsupported file type: {file_extension}. Supported types are pdf, docx, txt, csv, xlsx."
             )
 
-        file_name = f"{event.receiver_id}/{event.sender_id}/{str(int(datetime.now().timestamp() * 1000))}.{file_extension}"
+        now = datetime.now()
+        file_name = f"{event.receiver_id}/{event.sender_id}/{str(int(now.timestamp() * 1000))}.{file_extension}"
+        # the SDK buffers anything under its single-put size in memory anyway,
+        # so the payload is decoded once rather than streamed
         file_bytes = base64.b64decode(event.content)  # type: ignore
+        applicant_status_future = lookup_executor.submit(
+            get_applicant_status,
+            user_details=user_details,
+            applicant_id=event.sender_id,
+        )
         upload_response = self.azure_upload_file(
             {
                 "mime_type": event.mime_type,
@@ -193,13 +268,11 @@ class Service:
             )
             logger.info(f"Document processed successfully: {document}")
             response_event = Event(
-                mid=shortuuid.uuid(),
                 chat_id=event.chat_id,
                 content=DOCUMENT_SAVED,
                 msg_type="text",
                 receiver_id=event.sender_id,
                 sender_id=event.receiver_id,
-                timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
             )
             send_message(
                 user_details=user_details,
@@ -207,20 +280,14 @@ class Service:
                 event=response_event,
                 key=f"{event.receiver_id}_{event.sender_id}",
             )
-            applicants_repo = ApplicantRepository(get_db())
-            applicants_service = ApplicantService(applicants_repo)
-            applicant_status = applicants_service.get_applicant_status(
-                user_details=user_details, applicant_id=event.sender_id
-            )
+            applicant_status = applicant_status_future.result()
             if applicant_status == ApplicantStatus.NOT_INITIATED:
                 response_event = Event(
-                    mid=shortuuid.uuid(),
                     chat_id=event.chat_id,
                     content=INTRODUCTION_MESSAGE,
                     msg_type="text",
                     receiver_id=event.sender_id,
                     sender_id=event.receiver_id,
-                    timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
                 )
                 send_message(
                     user_details=user_details,
@@ -248,28 +315,18 @@ class Service:
         :param event: Dictionary containing 'mime_type', 'content', 'file_name'.
         """
         try:
-            blob_service_client = BlobServiceClient(
-                account_url=f"https://{os.getenv('AZURE_ACCOUNT_NAME', '')}.blob.core.windows.net/",
-                credential=os.getenv("AZURE_ACCOUNT_KEY", ""),
-            )
-            blob_client = blob_service_client.get_blob_client(
-                container=os.getenv("AZURE_CONTAINER_NAME", ""), blob=event["file_name"]
+            blob_client = get_blob_service_client().get_blob_client(
+                container=AZURE_CONTAINER_NAME, blob=event["file_name"]
             )
             blob_client.upload_blob(
                 event["content"],
                 metadata={"mime_type": event["mime_type"]},
                 overwrite=True,
+                max_concurrency=4,
             )
             if return_url:
-                blob_sas_token = generate_blob_sas(
-                    account_name=os.getenv("AZURE_ACCOUNT_NAME", ""),
-                    container_name=os.getenv("AZURE_CONTAINER_NAME", ""),
-                    blob_name=event["file_name"],
-                    account_key=os.getenv("AZURE_ACCOUNT_KEY", ""),
-                    expiry=datetime.now() + timedelta(minutes=5),
-                    permission=BlobSasPermissions(read=True),
-                )
-                return f"https://{os.getenv('AZURE_ACCOUNT_NAME', '')}.blob.core.windows.net/{os.getenv('AZURE_CONTAINER_NAME', '')}/{event['file_name']}?{blob_sas_token}"
+                blob_sas_token = get_blob_sas(event["file_name"])
+                return f"{AZURE_ACCOUNT_URL}{AZURE_CONTAINER_NAME}/{event['file_name']}?{blob_sas_token}"
             return True
         except Exception as e:
             raise MyException(
@@ -287,13 +344,7 @@ class Service:
         :return: Dict with 'file_url', 'file_name', 'file_extension'.
         """
         try:
-            s3_client = boto3.client(
-                "s3",
-                aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-                aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-                region_name=os.getenv("AWS_REGION"),
-            )
-            response = s3_client.put_object(
+            response = get_s3_client().put_object(
                 Bucket=config["cloud"]["storage"]["bucket"],
                 Key=event["file_name"],
                 Body=event["content"],
@@ -314,7 +365,5 @@ class Service:
             )
 
     def delete(self, applicant_id: int, recruiter_id: int) -> None:
-        repo = Repository(get_db())
         logger.info(f"[delete] Deleting applicant {applicant_id}")
-        repo.delete(recruiter_id=recruiter_id, applicant_id=applicant_id)
-        repo.close()
+        self.repo.delete(recruiter_id=recruiter_id, applicant_id=applicant_id)
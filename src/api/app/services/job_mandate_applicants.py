@@ -1,17 +1,17 @@
 from typing import List
 
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 from fastapi import HTTPException, status as http_status
 
 from app.core.logger import logger
 
-from app.db.postgres import get_db
-
 from app.models.user_login import UserDetails
 from app.models.job_mandate_applicants import Status, Model
 
 from app.repositories.job_mandate_applicants import Repository
 
+MODELS_ADAPTER = TypeAdapter(list[Model])
+
 
 class Service:
     def __init__(self, repo: Repository):
@@ -33,7 +33,7 @@ class Service:
             table = self.repo.create(model)
             if table:
                 model = Model.model_validate(table)
-                logger.debug(f"Created record: {model}")
+                logger.debug("Created record: %s", model)
                 return model
             else:
                 raise HTTPException(
@@ -94,7 +94,7 @@ class Service:
                     status_code=http_status.HTTP_404_NOT_FOUND,
                     detail="No records found",
                 )
-            return [Model.model_validate(table) for table in tables]
+            return MODELS_ADAPTER.validate_python(tables, from_attributes=True)
         except ValidationError as e:
             logger.error(f"Error fetching records: {e}")
             raise HTTPException(
@@ -115,7 +115,7 @@ class Service:
                     status_code=http_status.HTTP_404_NOT_FOUND,
                     detail="No records found",
                 )
-            return [Model.model_validate(table) for table in tables]
+            return MODELS_ADAPTER.validate_python(tables, from_attributes=True)
         except ValidationError as e:
             logger.error(f"Error fetching records: {e}")
             raise HTTPException(
@@ -145,6 +145,28 @@ class Service:
                 detail="Invalid data provided",
             )
 
+    def get_latest_by_applicant_id(
+        self, applicant_id: int, statuses: List[Status]
+    ) -> Model:
+        """
+        Fetch the applicant's record in the first of the given statuses that
+        has one, in a single query.
+        """
+        try:
+            record = self.repo.get_latest_by_applicant_id(applicant_id, statuses)
+            if not record:
+                raise HTTPException(
+                    status_code=http_status.HTTP_404_NOT_FOUND,
+                    detail="Record not found",
+                )
+            return Model.model_validate(record)
+        except ValidationError as e:
+            logger.error(f"Error fetching latest record by applicant_id: {e}")
+            raise HTTPException(
+                status_code=http_status.HTTP_409_CONFLICT,
+                detail="Invalid data provided",
+            )
+
     def update_status(
         self,
         user_details: UserDetails,
@@ -187,7 +209,5 @@ class Service:
             )
 
     def delete(self, applicant_id: int, recruiter_id: int) -> None:
-        repo = Repository(get_db())
         logger.info(f"[delete] Deleting applicant {applicant_id}")
-        repo.delete(recruiter_id=recruiter_id, applicant_id=applicant_id)
-        repo.close()
+        self.repo.delete(recruiter_id=recruiter_id, applicant_id=applicant_id)
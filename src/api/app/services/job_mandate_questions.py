@@ -1,17 +1,17 @@
 from typing import List
 
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 from fastapi import HTTPException, status as http_status
 
 from app.core.logger import logger
 
-from app.db.postgres import get_db
-
 from app.models.user_login import UserDetails
 from app.models.job_mandate_questions import Model, QuestionType
 
 from app.repositories.job_mandate_questions import Repository
 
+MODELS_ADAPTER = TypeAdapter(list[Model])
+
 
 class Service:
     def __init__(self, repo: Repository):
@@ -19,28 +19,16 @@ class Service:
 
     def create(self, model: Model) -> Model:
         try:
-            table = self.repo.get_by_id(
-                job_id=model.job_mandate_id,
-                applicant_id=model.applicant_id,
-                recruiter_id=model.recruiter_id,
-                question_id=model.question_id,
-            )
-            if table:
+            table = self.repo.create_if_not_exists(model)
+            if not table:
                 logger.debug("Record already exists")
                 raise HTTPException(
                     status_code=http_status.HTTP_409_CONFLICT,
                     detail="Record already exists",
                 )
-            table = self.repo.create(model)
-            if table:
-                model = Model.model_validate(table)
-                logger.debug(f"Created record: {model}")
-                return model
-            else:
-                raise HTTPException(
-                    status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to create record",
-                )
+            model = Model.model_validate(table)
+            logger.debug("Created record: %s", model)
+            return model
         except ValidationError as e:
             logger.error(f"Error creating record: {e}")
             raise HTTPException(
@@ -56,7 +44,6 @@ class Service:
                     status_code=http_status.HTTP_404_NOT_FOUND,
                     detail="Record not found",
                 )
-            Model.model_validate(table)
             return Model.model_validate(table)
         except ValidationError as e:
             logger.error(f"Error fetching record: {e}")
@@ -73,7 +60,7 @@ class Service:
                     status_code=http_status.HTTP_404_NOT_FOUND,
                     detail="No records found",
                 )
-            return [Model.model_validate(table) for table in tables]
+            return MODELS_ADAPTER.validate_python(tables, from_attributes=True)
         except ValidationError as e:
             logger.error(f"Error fetching records: {e}")
             raise HTTPException(
@@ -120,7 +107,7 @@ class Service:
                     status_code=http_status.HTTP_404_NOT_FOUND,
                     detail="No records found",
                 )
-            return [Model.model_validate(table) for table in tables]
+            return MODELS_ADAPTER.validate_python(tables, from_attributes=True)
         except ValidationError as e:
             logger.error(f"Error fetching records: {e}")
             raise HTTPException(
@@ -128,6 +115,17 @@ class Service:
                 detail="Invalid data provided",
             )
 
+    def count_by_question_type(
+        self, job_mandate_id: int, applicant_id: int, question_type: QuestionType
+    ) -> int:
+        """
+        Number of questions of this type already asked, without loading or
+        validating the rows.
+        """
+        return self.repo.count_by_question_type(
+            job_mandate_id, applicant_id, question_type
+        )
+
     def update_status(
         self,
         user_detail: UserDetails,
@@ -138,31 +136,19 @@ class Service:
         applicant_response: str,
     ) -> Model:
         try:
-            table = self.repo.get_by_id(
+            table = self.repo.update_status(
                 recruiter_id=user_detail.id,
+                job_mandate_id=job_mandate_id,
                 applicant_id=applicant_id,
-                job_id=job_mandate_id,
                 question_id=question_id,
+                status=status,
+                applicant_response=applicant_response,
             )
             if not table:
                 raise HTTPException(
                     status_code=http_status.HTTP_404_NOT_FOUND,
                     detail="Record not found",
                 )
-            updates = self.repo.update_status(
-                job_mandate_id, applicant_id, question_id, status, applicant_response
-            )
-            if updates != 1:
-                raise HTTPException(
-                    status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to update status",
-                )
-            table = self.repo.get_by_id(
-                recruiter_id=user_detail.id,
-                applicant_id=applicant_id,
-                job_id=job_mandate_id,
-                question_id=question_id,
-            )
             return Model.model_validate(table)
         except Exception as e:
             logger.error(f"Error updating status: {e}")
@@ -172,7 +158,5 @@ class Service:
             )
 
     def delete(self, applicant_id: int, recruiter_id: int) -> None:
-        repo = Repository(get_db())
         logger.info(f"[delete] Deleting applicant {applicant_id}")
-        repo.delete(recruiter_id=recruiter_id, applicant_id=applicant_id)
-        repo.close()
+        self.repo.delete(recruiter_id=recruiter_id, applicant_id=applicant_id)
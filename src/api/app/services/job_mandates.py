@@ -1,9 +1,13 @@
+from time import monotonic
+from threading import Lock
 from typing import List
 
+from pydantic import TypeAdapter
 from pydantic_core import ValidationError
 from fastapi import HTTPException, status as http_status
 
 from app.core.logger import logger
+from app.core.config import config
 
 from app.models.job_mandate_questions import QualifyingCriteria
 from app.models.job_mandates import (
@@ -16,6 +20,26 @@ from app.models.job_mandates import (
 
 from app.repositories.job_mandates import Repository
 
+MATCHING_FILTERS_ADAPTER = TypeAdapter(List[MatchingFilters])
+# filtering_criteria keys copied into MatchingFilters under the same name
+MATCHING_CRITERIA_FIELDS = (
+    "experience",
+    "type_of_experience",
+    "age",
+    "gender",
+    "education_level",
+)
+
+# Mandates are seeded from files and not edited in-app, so validated models are
+# shared across service instances for a short while instead of re-read per call;
+# the single-field getters read from the same cached model
+mandate_cache: dict[int, tuple[float, Model]] = {}
+# (fetched_at, matching filters, their JSON) of the active mandates, refreshed on
+# the same TTL; the JSON is what the matching prompt embeds
+active_jobs_cache: tuple[float, List[MatchingFilters], str] | None = None
+mandate_cache_lock = Lock()
+MANDATE_CACHE_TTL = config["job_mandates_cache_ttl"]
+
 
 class Service:
     def __init__(self, repo: Repository):
@@ -25,18 +49,24 @@ class Service:
         """
         Fetch the detail information  for a specific job.
         """
+        with mandate_cache_lock:
+            cached = mandate_cache.get(job_id)
+        if cached and monotonic() - cached[0] < MANDATE_CACHE_TTL:
+            return cached[1]
         try:
             table = self.repo.get_by_job_id(job_id)
             if not table:
                 logger.debug(
-                    f"[JobMandateService.get_job_information_by_id] Job not found for id: {job_id}"
+                    "[JobMandateService.get_by_id] Job not found for id: %s", job_id
                 )
                 raise HTTPException(
                     status_code=http_status.HTTP_404_NOT_FOUND,
                     detail="Job not found",
                 )
             model = Model.model_validate(table)
-            logger.debug(f"[JobMandateService.get_by_id] Job Mandate: {model}")
+            logger.debug("[JobMandateService.get_by_id] Job Mandate: %s", model)
+            with mandate_cache_lock:
+                mandate_cache[job_id] = (monotonic(), model)
             return model
         except ValidationError as e:
             logger.error(
@@ -51,122 +81,83 @@ class Service:
         """
         Fetch the detail information  for a specific job.
         """
-        try:
-            table = self.repo.get_by_job_id(job_id)
-            if not table:
-                logger.debug(
-                    f"[JobMandateService.get_job_information_by_id] Job not found for id: {job_id}"
-                )
-                raise HTTPException(
-                    status_code=http_status.HTTP_404_NOT_FOUND,
-                    detail="Job not found",
-                )
-            model = Model.model_validate(table)
-            logger.debug(
-                f"[JobMandateService.get_job_information_by_id] Job information: {model.job_information}"
-            )
-            return model.job_information
-        except ValidationError as e:
-            logger.error(
-                f"[JobMandateService.get_job_information_by_id] Validation error: {e.errors()}"
-            )
-            raise HTTPException(
-                status_code=http_status.HTTP_400_BAD_REQUEST,
-                detail=f"Validation error: {e.errors()}",
-            )
+        return self.get_by_id(job_id).job_information
 
     def get_qualifying_criteria_by_id(self, job_id: int) -> List[QualifyingCriteria]:
         """
         Show jobs to the applicant based on their filtering criteria.
         This function fetches matching jobs for the given job_id.
         """
-        try:
-            table = self.repo.get_by_job_id(job_id)
-            if not table:
-                logger.debug(
-                    f"[JobMandateService.get_qualifying_criteria_by_id] Job not found for id: {job_id}"
-                )
-                raise HTTPException(
-                    status_code=http_status.HTTP_404_NOT_FOUND,
-                    detail="Job not found",
-                )
-            model = Model.model_validate(table)
-            logger.debug(
-                f"[JobMandateService.get_qualifying_criteria_by_id] Qualifying criteria: {model.qualifying_criteria}"
-            )
-            return model.qualifying_criteria
-        except ValidationError as e:
-            logger.error(
-                f"[JobMandateService.get_qualifying_criteria_by_id] Validation error: {e.errors()}"
-            )
-            raise HTTPException(
-                status_code=http_status.HTTP_400_BAD_REQUEST,
-                detail=f"Validation error: {e.errors()}",
-            )
+        return self.get_by_id(job_id).qualifying_criteria
 
     def get_subjective_criteria_by_id(self, job_id: int) -> List[SubjectiveQuestions]:
         """
         Show jobs to the applicant based on their filtering criteria.
         This function fetches matching jobs for the given job_id.
         """
-        try:
-            table = self.repo.get_by_job_id(job_id)
-            if not table:
-                logger.debug(
-                    f"[JobMandateService.get_subjective_criteria_by_id] Job not found for id: {job_id}"
-                )
-                raise HTTPException(
-                    status_code=http_status.HTTP_404_NOT_FOUND,
-                    detail="Job not found",
-                )
-            model = Model.model_validate(table)
-            logger.debug(
-                f"[JobMandateService.get_subjective_criteria_by_id] Subjective criteria: {model.subjective_questions}"
-            )
-            return model.subjective_questions if model.subjective_questions else []
-        except ValidationError as e:
-            logger.error(
-                f"[JobMandateService.get_subjective_criteria_by_id] Validation error: {e.errors()}"
-            )
-            raise HTTPException(
-                status_code=http_status.HTTP_400_BAD_REQUEST,
-                detail=f"Validation error: {e.errors()}",
-            )
+        return self.get_by_id(job_id).subjective_questions or []
 
     def get_active_jobs(self) -> List[MatchingFilters]:
         """
         Fetch all job mandates.
         """
+        with mandate_cache_lock:
+            cached = active_jobs_cache
+        if cached and monotonic() - cached[0] < MANDATE_CACHE_TTL:
+            return cached[1]
+        return self.load_active_jobs()[1]
+
+    def get_active_jobs_json(self) -> str:
+        """
+        Fetch all job mandates as the JSON array of their matching filters,
+        serialized once per cache refresh.
+        """
+        with mandate_cache_lock:
+            cached = active_jobs_cache
+        if cached and monotonic() - cached[0] < MANDATE_CACHE_TTL:
+            return cached[2]
+        return self.load_active_jobs()[2]
+
+    def load_active_jobs(self) -> tuple[float, List[MatchingFilters], str]:
+        """
+        Query the active job mandates and refresh the shared cache with them.
+        """
+        global active_jobs_cache
         try:
-            tables = self.repo.get_by_status(status=Status.ACTIVE)
-            if not tables:
+            rows = self.repo.get_matching_filters_by_status(status=Status.ACTIVE)
+            if not rows:
                 logger.debug(
-                    f"[JobMandateService.get_active_jobs] No job mandates found"
+                    "[JobMandateService.get_active_jobs] No job mandates found"
                 )
                 raise HTTPException(
                     status_code=http_status.HTTP_404_NOT_FOUND,
                     detail="No job mandates found",
                 )
-            models = [Model.model_validate(table) for table in tables]
-            matching_filters = []
-            for model in models:
-                filtering_criteria = model.filtering_criteria
-                matching_filters.append(
-                    MatchingFilters(
-                        job_id=model.job_id,
-                        location=filtering_criteria.locations,
-                        experience=filtering_criteria.experience,
-                        type_of_experience=filtering_criteria.type_of_experience,
-                        age=filtering_criteria.age,
-                        gender=filtering_criteria.gender,
-                        education_level=filtering_criteria.education_level,
-                        salary_max=model.job_information.benefits.monthly_pay.max,
-                    )
-                )
+            matching_filters = MATCHING_FILTERS_ADAPTER.validate_python(
+                [
+                    {
+                        "job_id": row.job_id,
+                        "salary_max": row.salary_max,
+                        "location": row.filtering_criteria.get("locations"),
+                        **{
+                            field: row.filtering_criteria.get(field)
+                            for field in MATCHING_CRITERIA_FIELDS
+                        },
+                    }
+                    for row in rows
+                ]
+            )
             logger.debug(
-                f"[JobMandateService.get_active_jobs] Found {len(matching_filters)} active jobs"
+                "[JobMandateService.get_active_jobs] Found %d active jobs",
+                len(matching_filters),
             )
-            return matching_filters
+            matching_filters_json = MATCHING_FILTERS_ADAPTER.dump_json(
+                matching_filters, exclude_none=True
+            ).decode()
+            cached = (monotonic(), matching_filters, matching_filters_json)
+            with mandate_cache_lock:
+                active_jobs_cache = cached
+            return cached
         except ValidationError as e:
             logger.error(
                 f"[JobMandateService.get_active_jobs] Validation error: {e.errors()}"
@@ -1,18 +1,21 @@
 import os
+import re
 import json
-from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
 
-import shortuuid
 from openai import AzureOpenAI
 from fastapi import HTTPException
+from pydantic_core import to_json
+from sqlalchemy.orm import Session
 
-from app.db.postgres import get_db
+from app.db.postgres import session_scope
 
 from app.core import constants
 from app.core.config import config
 from app.core.logger import logger
-from app.core.authorization import get_user_details
+from app.core.authorization import get_cached_user_details
 
 from app.models.llm import MatchingJobs, AcceptanceModel
 from app.models.user_login import UserDetails
@@ -36,13 +39,79 @@ from app.repositories.job_mandate_questions import (
     Repository as JobMandateQuestionsRepository,
 )
 
-from app.services.util_service import send_message
+from app.services.util_service import send_message, send_messages
 from app.services.configs import Service as ConfigsService
 from app.services.applicants import Service as ApplicantsService
 from app.services.job_mandates import Service as JobMandatesService
 from app.services.job_mandate_questions import Service as JobMandateQuestionsService
 from app.services.job_mandate_applicants import Service as JobMandateApplicantsService
 
+# Runs independent lookups and status updates alongside other work of the same
+# turn; Sessions are not thread-safe, so every submitted call opens its own
+# session_scope instead of borrowing the turn's session
+io_executor = ThreadPoolExecutor(max_workers=4)
+
+# Structured-output schemas and prompts are fixed for the process lifetime
+MATCHING_JOBS_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "MatchingJobsSchema",
+        "schema": MatchingJobs.model_json_schema(),
+    },
+}
+ACCEPTANCE_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "MatchingJobsSchema",
+        "schema": AcceptanceModel.model_json_schema(),
+    },
+}
+MANDATE_MATCHING_PROMPT = config["llm"]["mandate_matching"]["prompt"]
+USER_RESPONSE_ACCEPTANCE_PROMPT = config["llm"]["user_response_acceptance"]["prompt"]
+EVALUATE_QUALIFYING_CRITERIA_PROMPT = config["llm"]["evaluate_qualifying_criteria"][
+    "prompt"
+]
+# Statuses that place an applicant in the job flow, the furthest along first
+LATEST_JOB_STATUSES = [
+    JobMandateApplicantsStatus.CRITERIA_SUCCESS,
+    JobMandateApplicantsStatus.USER_ACCEPTED,
+    JobMandateApplicantsStatus.OFFERED,
+    JobMandateApplicantsStatus.MATCHED,
+]
+# normalized offer replies are classified, and cached, on this many characters
+ACCEPTANCE_MAX_LENGTH = 256
+# the complete job_ids array at the start of a streamed MatchingJobs reply
+JOB_IDS_PATTERN = re.compile(r'"job_ids"\s*:\s*(\[[^\]]*\])')
+
+
+def update_job_mandate_applicant_status(
+    user_details: UserDetails,
+    applicant_id: int,
+    job_mandate_id: int,
+    status: JobMandateApplicantsStatus,
+) -> None:
+    """
+    Mandate status update for io_executor, on a session of its own.
+    """
+    with session_scope() as db:
+        JobMandateApplicantsService(JobMandateApplicantsRepository(db)).update_status(
+            user_details=user_details,
+            applicant_id=applicant_id,
+            job_mandate_id=job_mandate_id,
+            status=status,
+        )
+
+
+@lru_cache(maxsize=4096)
+def classify_acceptance(content: str) -> bool:
+    """
+    Memoized offer acceptance judgement, kept off the instance so the cache
+    does not key on or pin the JobService.
+    """
+    return job_service.classify(
+        USER_RESPONSE_ACCEPTANCE_PROMPT, {"applicant_response": content}
+    )
+
 
 class JobService:
     """
@@ -57,6 +126,15 @@ class JobService:
 
     """
 
+    def __init__(self):
+        # one client per process, so LLM calls reuse its pooled HTTPS connections
+        self.client = AzureOpenAI(
+            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", ""),
+            azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+        )
+
     def parse_job(self, event: Dict[str, Any], key: str) -> None:
         """
         Parses incoming WhatsApp events and processes them based on applicant status.
@@ -82,100 +160,98 @@ class JobService:
         logger.info(f"[parse_job_flow.parse_event] Processing event with key: {key}")
         logger.debug(f"[parse_job_flow.parse_event] Event keys: {list(event.keys())}")
 
+        # one session for the whole turn, shared by every repository below; its
+        # transaction is ended before each model call, so under PgBouncer the
+        # server connection is not held through the round trip
         try:
-            recruiter_id = str(event.get("receiver_id"))
-            applicant_id = int(event.get("sender_id", 0))
-            user_details = get_user_details(x_user_id=recruiter_id, db=get_db())
-            job_mandate_questions_repo = JobMandateQuestionsRepository(get_db())
-            job_mandate_questions_service = JobMandateQuestionsService(
-                job_mandate_questions_repo
-            )
-            # Extract IDs from event
-            logger.info(
-                f"[parse_job_flow.parse_event] Processing message from applicant {applicant_id} to recruiter {recruiter_id}"
-            )
-            latest_job = self.get_latest_job(applicant_id)
-            if (
-                latest_job.job_mandate_applicant_status
-                == JobMandateApplicantsStatus.CRITERIA_SUCCESS
-            ):
-                try:
-                    subjective_questions_answered = (
-                        job_mandate_questions_service.get_by_question_type(
-                            applicant_id=applicant_id,
-                            job_mandate_id=latest_job.job_mandate.job_id,
-                            question_type=QuestionType.SUBJECTIVE,
+            with session_scope() as db:
+                recruiter_id = str(event.get("receiver_id"))
+                applicant_id = int(event.get("sender_id", 0))
+                # the recruiter lookup, cached or on a session_scope of its own,
+                # runs while the turn's session loads the latest job
+                user_details_future = io_executor.submit(
+                    get_cached_user_details, recruiter_id
+                )
+                job_mandate_questions_repo = JobMandateQuestionsRepository(db)
+                job_mandate_questions_service = JobMandateQuestionsService(
+                    job_mandate_questions_repo
+                )
+                # Extract IDs from event
+                logger.info(
+                    f"[parse_job_flow.parse_event] Processing message from applicant {applicant_id} to recruiter {recruiter_id}"
+                )
+                latest_job = self.get_latest_job(applicant_id, db=db)
+                user_details = user_details_future.result()
+                match latest_job.job_mandate_applicant_status:
+                    case JobMandateApplicantsStatus.CRITERIA_SUCCESS:
+                        subjective_questions_answered = (
+                            job_mandate_questions_service.count_by_question_type(
+                                applicant_id=applicant_id,
+                                job_mandate_id=latest_job.job_mandate.job_id,
+                                question_type=QuestionType.SUBJECTIVE,
+                            )
+                        )
+                        if len(latest_job.job_mandate.subjective_questions) > subjective_questions_answered:  # type: ignore
+                            self.process_subjective_response(
+                                event=event,
+                                user_details=user_details,
+                                job_mandate=latest_job.job_mandate,
+                                subjective_questions_answered=subjective_questions_answered,
+                                db=db,
+                            )
+                    case JobMandateApplicantsStatus.USER_ACCEPTED:
+                        qualifying_questions_answered = (
+                            job_mandate_questions_service.count_by_question_type(
+                                applicant_id=applicant_id,
+                                job_mandate_id=latest_job.job_mandate.job_id,
+                                question_type=QuestionType.OBJECTIVE,
+                            )
                         )
-                    )
-                except HTTPException as e:
-                    subjective_questions_answered = []
-                if len(latest_job.job_mandate.subjective_questions) > len(  # type: ignore
-                    subjective_questions_answered
-                ):
-                    self.process_subjective_response(
-                        event=event,
-                        user_details=user_details,
-                        job_mandate=latest_job.job_mandate,
-                        subjective_questions_answered=subjective_questions_answered,
-                    )
-            elif (
-                latest_job.job_mandate_applicant_status
-                == JobMandateApplicantsStatus.USER_ACCEPTED
-            ):
-                try:
-                    qualifying_questions_answered = (
-                        job_mandate_questions_service.get_by_question_type(
+                        self.process_qualifying_response(
+                            event=event,
+                            user_details=user_details,
+                            job_mandate=latest_job.job_mandate,
+                            qualifying_questions_answered=qualifying_questions_answered,
+                            db=db,
+                        )
+                    case JobMandateApplicantsStatus.OFFERED:
+                        self.process_offered_job(
+                            event=event,
+                            user_details=user_details,
                             applicant_id=applicant_id,
-                            job_mandate_id=latest_job.job_mandate.job_id,
-                            question_type=QuestionType.OBJECTIVE,
+                            job_mandate=latest_job.job_mandate,
+                            db=db,
                         )
-                    )
-                except HTTPException as e:
-                    qualifying_questions_answered = []
-                self.process_qualifying_response(
-                    event=event,
-                    user_details=user_details,
-                    job_mandate=latest_job.job_mandate,
-                    qualifying_questions_answered=qualifying_questions_answered,
-                )
-            elif (
-                latest_job.job_mandate_applicant_status
-                == JobMandateApplicantsStatus.OFFERED
-            ):
-                self.process_offered_job(
-                    event=event,
-                    user_details=user_details,
-                    applicant_id=applicant_id,
-                    job_mandate=latest_job.job_mandate,
-                )
-            elif (
-                latest_job.job_mandate_applicant_status
-                == JobMandateApplicantsStatus.MATCHED
-            ):
-                self.offer_new_job(user_details=user_details, applicant_id=applicant_id)
-            else:
-                try:
-                    self.get_matching_jobs(
-                        user_details=user_details, applicant_id=applicant_id
-                    )
-                    self.offer_new_job(user_details=user_details, applicant_id=applicant_id)
-                except Exception as e:
-                    response_event = Event(
-                        chat_id=f"{applicant_id}@s.whatsapp.net",
-                        content=constants.NO_JOB_OFFERS_MESSAGE,
-                        msg_type="text",
-                        receiver_id=applicant_id,
-                        sender_id=user_details.id,
-                        timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                        mid=shortuuid.uuid(),
-                    )
-                    send_message(
-                        user_details=user_details,
-                        applicant_id=applicant_id,
-                        event=response_event,
-                        key=f"{user_details.id}_{applicant_id}",
-                    )
-            job_mandate_questions_repo.close()
+                    case JobMandateApplicantsStatus.MATCHED:
+                        self.offer_new_job(
+                            user_details=user_details, applicant_id=applicant_id, db=db
+                        )
+                    case _:
+                        try:
+                            self.get_matching_jobs(
+                                user_details=user_details,
+                                applicant_id=applicant_id,
+                                db=db,
+                            )
+                            self.offer_new_job(
+                                user_details=user_details,
+                                applicant_id=applicant_id,
+                                db=db,
+                            )
+                        except Exception as e:
+                            response_event = Event(
+                                chat_id=f"{applicant_id}@s.whatsapp.net",
+                                content=constants.NO_JOB_OFFERS_MESSAGE,
+                                msg_type="text",
+                                receiver_id=applicant_id,
+                                sender_id=user_details.id,
+                            )
+                            send_message(
+                                user_details=user_details,
+                                applicant_id=applicant_id,
+                                event=response_event,
+                                key=f"{user_details.id}_{applicant_id}",
+                            )
         except Exception as e:
             logger.error(
                 f"[parse_job_flow.parse_event] Failed to process event with key {key}: {e}",
@@ -184,11 +260,9 @@ class JobService:
             raise
 
     def get_matching_jobs(
-        self, user_details: UserDetails, applicant_id: int
+        self, user_details: UserDetails, applicant_id: int, db: Session
     ) -> MatchingJobs:
         response_event = Event(
-            mid=shortuuid.uuid(),
-            timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
             chat_id=f"{applicant_id}@s.whatsapp.net",
             sender_id=user_details.id,
             receiver_id=applicant_id,
@@ -201,70 +275,77 @@ class JobService:
             event=response_event,
             key=f"{user_details.id}_{applicant_id}",
         )
-        applicants_repo = ApplicantsRepository(get_db())
+        applicants_repo = ApplicantsRepository(db)
         applicants_service = ApplicantsService(applicants_repo)
-        job_mandates_repo = JobMandatesRepository(get_db())
+        job_mandates_repo = JobMandatesRepository(db)
         job_mandates_service = JobMandatesService(job_mandates_repo)
-        job_mandate_applicants_repo = JobMandateApplicantsRepository(get_db())
+        job_mandate_applicants_repo = JobMandateApplicantsRepository(db)
         job_mandate_applicants_service = JobMandateApplicantsService(
             job_mandate_applicants_repo
         )
 
-        client = AzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", ""),
-            azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-        )
-
         # Prepare the LLM schema for structured output
         logger.debug("[TextService.get_matching_jobs] Setting up LLM schema")
-        llm_schema = {
-            "type": "json_schema",
-            "json_schema": {
-                "name": "MatchingJobsSchema",
-                "schema": MatchingJobs.model_json_schema(),
-            },
-        }
+        llm_schema = MATCHING_JOBS_SCHEMA
 
         # Get system prompt and conversation history
-        system_prompt = config["llm"]["mandate_matching"]["prompt"]
+        system_prompt = MANDATE_MATCHING_PROMPT
         logger.debug("[TextService.get_basic_details] Fetching conversation history")
         # Get applicant details
         logger.debug("[TextService.get_matching_jobs] Retrieving applicant details")
         applicant = applicants_service.get_applicant_by_recruiter_and_applicant(
             user_details, applicant_id=applicant_id
         )
+        if not applicant.details:
+            # nothing to match on; offer_new_job finds no MATCHED mandate and
+            # tells the applicant there are no offers
+            logger.info(
+                "[TextService.get_matching_jobs] No details for applicant %s, skipping matching",
+                applicant_id,
+            )
+            return MatchingJobs(job_ids=[], reasoning=[])
 
-        job_mandates = job_mandates_service.get_active_jobs()
+        job_descriptions = job_mandates_service.get_active_jobs_json()
 
-        completion = client.chat.completions.create(
+        # release the connection for the model round trip; the writes below
+        # begin a new transaction
+        db.commit()
+        completion = self.client.chat.completions.create(
             model="gpt-4.1",
             messages=[
                 {"role": "system", "content": system_prompt},
                 {
                     "role": "user",
-                    "content": json.dumps(
-                        {
-                            "applicant_details": applicant.details.model_dump(
-                                exclude_none=True
-                            )
-                            if applicant.details
-                            else None,
-                            "job_descriptions": [
-                                job_mandate.model_dump(exclude_none=True)
-                                for job_mandate in job_mandates
-                            ],
-                        }
-                    ),
+                    # the job list is serialized once per cache refresh, so only
+                    # the applicant is dumped per call
+                    "content": '{"applicant_details":'
+                    + to_json(applicant.details, exclude_none=True).decode()
+                    + ',"job_descriptions":'
+                    + job_descriptions
+                    + "}",
                 },
             ],
             temperature=0,
             response_format=llm_schema,  # type: ignore
+            stream=True,
         )
-        content = completion.choices[0].message.content or ""
+        # job_ids is generated before the per-job reasoning, which nothing
+        # downstream reads, so the stream is dropped once the id list is complete
+        content = ""
+        for chunk in completion:
+            if not chunk.choices:
+                continue
+            content += chunk.choices[0].delta.content or ""
+            job_ids = JOB_IDS_PATTERN.search(content)
+            if job_ids:
+                completion.close()
+                matching_jobs = MatchingJobs(
+                    job_ids=json.loads(job_ids.group(1)), reasoning=[]
+                )
+                break
+        else:
+            matching_jobs = MatchingJobs.model_validate_json(content)
         logger.debug("[TextService.get_matching_jobs] Processing AI response")
-        matching_jobs = MatchingJobs.model_validate(json.loads(content))
         if matching_jobs.job_ids:
             job_mandates = job_mandate_applicants_service.create_many(
                 user_details, applicant_id, matching_jobs.job_ids
@@ -274,17 +355,16 @@ class JobService:
                 applicant_id=applicant_id,
                 status=ApplicantStatus.MANDATE_MATCHING,
             )
-        applicants_repo.close()
-        job_mandates_repo.close()
-        job_mandate_applicants_repo.close()
         return matching_jobs
 
-    def offer_new_job(self, applicant_id: int, user_details: UserDetails):
-        applicants_repo = ApplicantsRepository(get_db())
+    def offer_new_job(
+        self, applicant_id: int, user_details: UserDetails, db: Session
+    ):
+        applicants_repo = ApplicantsRepository(db)
         applicants_service = ApplicantsService(applicants_repo)
-        job_mandates_repo = JobMandatesRepository(get_db())
+        job_mandates_repo = JobMandatesRepository(db)
         job_mandates_service = JobMandatesService(job_mandates_repo)
-        job_mandate_applicants_repo = JobMandateApplicantsRepository(get_db())
+        job_mandate_applicants_repo = JobMandateApplicantsRepository(db)
         job_mandate_applicants_service = JobMandateApplicantsService(
             job_mandate_applicants_repo
         )
@@ -322,8 +402,6 @@ class JobService:
                 msg_type="text",
                 receiver_id=applicant_id,
                 sender_id=user_details.id,
-                timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                mid=shortuuid.uuid(),
             )
             send_message(
                 user_details=user_details,
@@ -347,8 +425,6 @@ class JobService:
                 msg_type="text",
                 receiver_id=applicant_id,
                 sender_id=user_details.id,
-                timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                mid=shortuuid.uuid(),
             )
             send_message(
                 user_details=user_details,
@@ -356,51 +432,31 @@ class JobService:
                 event=send_event,
                 key=f"{user_details.id}_{applicant_id}",
             )
-        applicants_repo.close()
-        job_mandates_repo.close()
-        job_mandate_applicants_repo.close()
 
     def parse_acceptance(self, content: str) -> bool:
-        client = AzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", ""),
-            azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+        # replies to an offer are mostly short and repeat ("yes", "ok", "haan"),
+        # so they are classified once per case/spacing-insensitive text, cut to
+        # a bounded length so long one-off replies cannot bloat the cache keys
+        return classify_acceptance(
+            " ".join(content.lower().split())[:ACCEPTANCE_MAX_LENGTH]
         )
 
-        # Prepare the LLM schema for structured output
-        logger.debug("[TextService.get_matching_jobs] Setting up LLM schema")
-        llm_schema = {
-            "type": "json_schema",
-            "json_schema": {
-                "name": "MatchingJobsSchema",
-                "schema": AcceptanceModel.model_json_schema(),
-            },
-        }
-
-        # Get system prompt and conversation history
-        system_prompt = config["llm"]["user_response_acceptance"]["prompt"]
-
-        completion = client.chat.completions.create(
+    def classify(self, system_prompt: str, payload: Dict[str, Any]) -> bool:
+        """
+        Asks the model for the yes/no judgement the prompt describes on the
+        payload, through the shared client and the AcceptanceModel schema.
+        """
+        completion = self.client.chat.completions.create(
             model="gpt-4.1",
             messages=[
                 {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": json.dumps(
-                        {
-                            "applicant_response": content,
-                        }
-                    ),
-                },
+                {"role": "user", "content": json.dumps(payload)},
             ],
             temperature=0,
-            response_format=llm_schema,  # type: ignore
+            response_format=ACCEPTANCE_SCHEMA,  # type: ignore
         )
         content = completion.choices[0].message.content or ""
-        logger.debug("[TextService.get_matching_jobs] Processing AI response")
-        acceptance = AcceptanceModel.model_validate(json.loads(content))
-        return acceptance.response_text
+        return AcceptanceModel.model_validate_json(content).response_text
 
     def process_offered_job(
         self,
@@ -408,11 +464,15 @@ class JobService:
         user_details: UserDetails,
         applicant_id: int,
         job_mandate: JobMandates,
+        db: Session,
     ) -> None:
-        job_mandate_applicants_repo = JobMandateApplicantsRepository(get_db())
+        job_mandate_applicants_repo = JobMandateApplicantsRepository(db)
         job_mandate_applicants_service = JobMandateApplicantsService(
             job_mandate_applicants_repo
         )
+        # release the connection for the model round trip; the writes below
+        # begin a new transaction
+        db.commit()
         success: bool = self.parse_acceptance(event["content"])
         if success:
             job_mandate_applicants_service.update_status(
@@ -423,7 +483,6 @@ class JobService:
             )
             response_event = Event(
                 mid=event["mid"],
-                timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
                 chat_id=event["chat_id"],
                 receiver_id=event["sender_id"],
                 sender_id=event["receiver_id"],
@@ -432,25 +491,18 @@ class JobService:
                     job_mandate.job_information.title
                 ),
             )
-            send_message(
-                user_details=user_details,
-                applicant_id=applicant_id,
-                event=response_event,
-                key=f"{user_details.id}_{applicant_id}",
-            )
-            response_event = Event(
+            question_event = Event(
                 mid=event["mid"],
-                timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
                 chat_id=event["chat_id"],
                 receiver_id=event["sender_id"],
                 sender_id=event["receiver_id"],
                 msg_type="text",
                 content=job_mandate.qualifying_criteria[0].question,
             )
-            send_message(
+            send_messages(
                 user_details=user_details,
                 applicant_id=applicant_id,
-                event=response_event,
+                events=[response_event, question_event],
                 key=f"{user_details.id}_{applicant_id}",
             )
         else:
@@ -460,56 +512,21 @@ class JobService:
                 job_mandate_id=job_mandate.job_id,
                 status=JobMandateApplicantsStatus.USER_REJECTED,
             )
-            self.offer_new_job(applicant_id=applicant_id, user_details=user_details)
-        job_mandate_applicants_repo.close()
+            self.offer_new_job(
+                applicant_id=applicant_id, user_details=user_details, db=db
+            )
 
     def parse_qualifying_response(
         self, content: str, question: QualifyingCriteria
     ) -> bool:
-        client = AzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", ""),
-            azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-        )
-
-        # Prepare the LLM schema for structured output
-        logger.debug("[TextService.get_matching_jobs] Setting up LLM schema")
-        llm_schema = {
-            "type": "json_schema",
-            "json_schema": {
-                "name": "MatchingJobsSchema",
-                "schema": AcceptanceModel.model_json_schema(),
+        return self.classify(
+            EVALUATE_QUALIFYING_CRITERIA_PROMPT,
+            {
+                "question": question.question,
+                "answer_key": [item.model_dump() for item in question.answers],
+                "applicant_response": content,
             },
-        }
-
-        # Get system prompt and conversation history
-        system_prompt = config["llm"]["evaluate_qualifying_criteria"]["prompt"]
-
-        completion = client.chat.completions.create(
-            model="gpt-4.1",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": json.dumps(
-                        {
-                            "question": question.question,
-                            "answer_key": [
-                                item.model_dump() for item in question.answers
-                            ],
-                            "applicant_response": content,
-                        }
-                    ),
-                },
-            ],
-            temperature=0,
-            response_format=llm_schema,  # type: ignore
         )
-        content = completion.choices[0].message.content or ""
-        logger.debug("[TextService.get_matching_jobs] Processing AI response")
-        acceptance = AcceptanceModel.model_validate(json.loads(content))
-        return acceptance.response_text
 
     def send_interview_details(
         self,
@@ -517,12 +534,13 @@ class JobService:
         user_details: UserDetails,
         applicant_id: int,
         job_mandate: JobMandates,
+        db: Session,
     ):
-        applicants_repo = ApplicantsRepository(get_db())
+        applicants_repo = ApplicantsRepository(db)
         applicants_service = ApplicantsService(applicants_repo)
-        configs_repo = ConfigsRepositiry(get_db())
+        configs_repo = ConfigsRepositiry(db)
         configs_service = ConfigsService(configs_repo)
-        job_mandate_applicants_repo = JobMandateApplicantsRepository(get_db())
+        job_mandate_applicants_repo = JobMandateApplicantsRepository(db)
         job_mandate_applicants_service = JobMandateApplicantsService(
             job_mandate_applicants_repo
         )
@@ -530,26 +548,23 @@ class JobService:
         content = f"Congratulations! You have been shortlisted for the job position. Find the interview details below. We will call you soon."
         response_event = Event(
             mid=event["mid"],
-            timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
             chat_id=event["chat_id"],
             receiver_id=event["sender_id"],
             sender_id=event["receiver_id"],
             msg_type="text",
             content=content,
         )
-        send_message(
-            user_details=user_details,
-            applicant_id=applicant_id,
-            event=response_event,
-            key=f"{user_details.id}_{applicant_id}",
-        )
         interview_details = job_mandate.job_information.interview_process
         documents = "\n".join(interview_details.documents)
-        response_event.content = f"Number of interviews: {interview_details.rounds}\nDocuments Required: {documents}\nJob starting: {interview_details.start_date}"
-        send_message(
+        details_event = response_event.model_copy(
+            update={
+                "content": f"Number of interviews: {interview_details.rounds}\nDocuments Required: {documents}\nJob starting: {interview_details.start_date}"
+            }
+        )
+        send_messages(
             user_details=user_details,
             applicant_id=applicant_id,
-            event=response_event,
+            events=[response_event, details_event],
             key=f"{user_details.id}_{applicant_id}",
         )
         job_mandate_applicants_service.update_status(
@@ -569,30 +584,27 @@ class JobService:
             applicant_id=applicant_id,
             status=ApplicantStatus.SHORTLISTED,
         )
-        configs_repo.close()
-        applicants_repo.close()
-        job_mandate_applicants_repo.close()
 
     def process_qualifying_response(
         self,
         event: dict,
         user_details: UserDetails,
         job_mandate: JobMandates,
-        qualifying_questions_answered: List[JobMandateQuestions],
+        qualifying_questions_answered: int,
+        db: Session,
     ):
-        job_mandate_applicants_repo = JobMandateApplicantsRepository(get_db())
-        job_mandate_applicants_service = JobMandateApplicantsService(
-            job_mandate_applicants_repo
-        )
-        job_mandate_questions_repo = JobMandateQuestionsRepository(get_db())
+        job_mandate_questions_repo = JobMandateQuestionsRepository(db)
         job_mandate_questions_service = JobMandateQuestionsService(
             job_mandate_questions_repo
         )
         recruiter_id = str(event.get("receiver_id"))
         applicant_id = int(event.get("sender_id", 0))
         applicant_response = event["content"]
-        current_question_order_id = len(qualifying_questions_answered)
+        current_question_order_id = qualifying_questions_answered
         current_question = job_mandate.qualifying_criteria[current_question_order_id]
+        # release the connection for the model round trip; the writes below
+        # begin a new transaction
+        db.commit()
         pass_ = self.parse_qualifying_response(applicant_response, current_question)
         job_mandate_question_model = JobMandateQuestions(
             job_mandate_id=job_mandate.job_id,
@@ -607,33 +619,35 @@ class JobService:
         job_mandate_questions_service.create(model=job_mandate_question_model)
         if not pass_:
             response_event = Event(
-                mid=shortuuid.uuid(),
-                timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
                 chat_id=f"{applicant_id}@s.whatsapp.net",
                 sender_id=user_details.id,
                 receiver_id=applicant_id,
                 msg_type="text",
                 content=constants.QUALIFYING_CRITERIA_FAILED,
             )
+            status_future = io_executor.submit(
+                update_job_mandate_applicant_status,
+                user_details=user_details,
+                applicant_id=applicant_id,
+                job_mandate_id=job_mandate.job_id,
+                status=JobMandateApplicantsStatus.CRITERIA_FAILED,
+            )
             send_message(
                 user_details=user_details,
                 applicant_id=applicant_id,
                 event=response_event,
                 key=f"{user_details.id}_{applicant_id}",
             )
-            job_mandate_applicants_service.update_status(
-                user_details=user_details,
-                applicant_id=applicant_id,
-                job_mandate_id=job_mandate.job_id,
-                status=JobMandateApplicantsStatus.CRITERIA_FAILED,
+            # offer_new_job must see this mandate as failed
+            status_future.result()
+            self.offer_new_job(
+                applicant_id=applicant_id, user_details=user_details, db=db
             )
-            self.offer_new_job(applicant_id=applicant_id, user_details=user_details)
             return
         if current_question_order_id + 1 < len(job_mandate.qualifying_criteria):
             # check conditions
             response_event = Event(
                 mid=event["mid"],
-                timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
                 chat_id=event["chat_id"],
                 receiver_id=event["sender_id"],
                 sender_id=event["receiver_id"],
@@ -650,7 +664,8 @@ class JobService:
             )
         else:
             if job_mandate.subjective_questions:
-                job_mandate_applicants_service.update_status(
+                status_future = io_executor.submit(
+                    update_job_mandate_applicant_status,
                     user_details=user_details,
                     applicant_id=applicant_id,
                     job_mandate_id=job_mandate.job_id,
@@ -659,7 +674,6 @@ class JobService:
                 content = job_mandate.subjective_questions[0].question
                 response_event = Event(
                     mid=event["mid"],
-                    timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
                     chat_id=event["chat_id"],
                     receiver_id=event["sender_id"],
                     sender_id=event["receiver_id"],
@@ -672,31 +686,32 @@ class JobService:
                     event=response_event,
                     key=f"{recruiter_id}_{applicant_id}",
                 )
+                status_future.result()
             else:
                 self.send_interview_details(
                     event=event,
                     user_details=user_details,
                     applicant_id=applicant_id,
                     job_mandate=job_mandate,
+                    db=db,
                 )
-        job_mandate_applicants_repo.close()
-        job_mandate_questions_repo.close()
 
     def process_subjective_response(
         self,
         event: dict,
         user_details: UserDetails,
         job_mandate: JobMandates,
-        subjective_questions_answered: List[JobMandateQuestions],
+        subjective_questions_answered: int,
+        db: Session,
     ):
-        job_mandate_questions_repo = JobMandateQuestionsRepository(get_db())
+        job_mandate_questions_repo = JobMandateQuestionsRepository(db)
         job_mandate_questions_service = JobMandateQuestionsService(
             job_mandate_questions_repo
         )
         recruiter_id = str(event.get("receiver_id"))
         applicant_id = int(event.get("sender_id", 0))
         applicant_response = event["content"]
-        current_question_order_id = len(subjective_questions_answered)
+        current_question_order_id = subjective_questions_answered
         current_question = job_mandate.subjective_questions[current_question_order_id]  # type: ignore
         job_mandate_question_model = JobMandateQuestions(
             job_mandate_id=job_mandate.job_id,
@@ -711,7 +726,6 @@ class JobService:
         if current_question_order_id + 1 < len(job_mandate.subjective_questions):  # type: ignore
             response_event = Event(
                 mid=event["mid"],
-                timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
                 chat_id=event["chat_id"],
                 receiver_id=event["sender_id"],
                 sender_id=event["receiver_id"],
@@ -732,83 +746,29 @@ class JobService:
                 user_details=user_details,
                 applicant_id=applicant_id,
                 job_mandate=job_mandate,
+                db=db,
             )
-        job_mandate_questions_repo.close()
 
-    def get_latest_job(self, applicant_id: int) -> LatestJob:
-        job_mandates_repo = JobMandatesRepository(get_db())
+    def get_latest_job(self, applicant_id: int, db: Session) -> LatestJob:
+        job_mandates_repo = JobMandatesRepository(db)
         job_mandates_service = JobMandatesService(job_mandates_repo)
-        job_mandate_applicants_repo = JobMandateApplicantsRepository(get_db())
+        job_mandate_applicants_repo = JobMandateApplicantsRepository(db)
         job_mandate_applicants_service = JobMandateApplicantsService(
             job_mandate_applicants_repo
         )
         try:
-            criteria_success = (
-                job_mandate_applicants_service.get_by_applicant_id_and_status(
-                    applicant_id=applicant_id,
-                    status=JobMandateApplicantsStatus.CRITERIA_SUCCESS,
-                )
-            )
-        except HTTPException as e:
-            logger.error(
-                f"[parse_job_flow.parse_event] Error fetching criteria success: {e}"
-            )
-            criteria_success = None
-        if criteria_success:
-            job_mandate = job_mandates_service.get_by_id(
-                criteria_success.job_mandate_id
-            )
-            return LatestJob(
-                job_mandate=job_mandate,
-                job_mandate_applicant_status=JobMandateApplicantsStatus.CRITERIA_SUCCESS,
-            )
-        try:
-            user_accepted = (
-                job_mandate_applicants_service.get_by_applicant_id_and_status(
-                    applicant_id=applicant_id,
-                    status=JobMandateApplicantsStatus.USER_ACCEPTED,
-                )
+            latest = job_mandate_applicants_service.get_latest_by_applicant_id(
+                applicant_id=applicant_id, statuses=LATEST_JOB_STATUSES
             )
         except HTTPException as e:
             logger.error(
-                f"[parse_job_flow.parse_event] Error fetching criteria success: {e}"
+                f"[parse_job_flow.parse_event] Error fetching latest job status: {e}"
             )
-            user_accepted = None
-        if user_accepted:
-            job_mandate = job_mandates_service.get_by_id(user_accepted.job_mandate_id)
+            latest = None
+        if latest:
             return LatestJob(
-                job_mandate=job_mandate,
-                job_mandate_applicant_status=JobMandateApplicantsStatus.USER_ACCEPTED,
-            )
-        try:
-            offered = job_mandate_applicants_service.get_by_applicant_id_and_status(
-                applicant_id=applicant_id, status=JobMandateApplicantsStatus.OFFERED
-            )
-        except HTTPException as e:
-            logger.error(
-                f"[parse_job_flow.parse_event] Error fetching criteria success: {e}"
-            )
-            offered = None
-        if offered:
-            job_mandate = job_mandates_service.get_by_id(offered.job_mandate_id)
-            return LatestJob(
-                job_mandate=job_mandate,
-                job_mandate_applicant_status=JobMandateApplicantsStatus.OFFERED,
-            )
-        try:
-            matched = job_mandate_applicants_service.get_by_applicant_id_and_status(
-                applicant_id=applicant_id, status=JobMandateApplicantsStatus.MATCHED
-            )
-        except HTTPException as e:
-            logger.error(
-                f"[parse_job_flow.parse_event] Error fetching criteria success: {e}"
-            )
-            matched = None
-        if matched:
-            job_mandate = job_mandates_service.get_by_id(matched.job_mandate_id)
-            return LatestJob(
-                job_mandate=job_mandate,
-                job_mandate_applicant_status=JobMandateApplicantsStatus.MATCHED,
+                job_mandate=job_mandates_service.get_by_id(latest.job_mandate_id),
+                job_mandate_applicant_status=latest.status,
             )
         logger.warning(
             f"[parse_job_flow.parse_event] No job mandate found for applicant {applicant_id}"
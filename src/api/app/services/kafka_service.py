@@ -1,18 +1,22 @@
-import json
+import os
+from typing import List
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-import redis
 import shortuuid
+from pydantic_core import from_json
 from kafka import KafkaConsumer
+from kafka.consumer.fetcher import ConsumerRecord
 
-from app.db.postgres import get_db
+from app.db.postgres import session_scope
 
 from app.core.config import config
 from app.core.logger import logger
-from app.core.authorization import get_user_details
+from app.core.authorization import get_cached_user_details
 from app.core.exception import ErrorMessages, MyException
 
-from app.models.utils import Event
+from app.models.utils import Event, event_timestamp
+from app.models.user_login import UserDetails
 
 from app.services.util_service import send_message, producer
 from app.services.documents import Service as DocumentService
@@ -20,6 +24,29 @@ from app.services.redis_service import Service as RedisService
 
 from app.repositories.documents import Repository as Repository
 
+# Failures are reported back to the recruiter only for configured numbers
+RECRUITER_IDS = frozenset(recruiter["recruiter_id"] for recruiter in config["whatsapp"])
+
+# Handles the chats of a candidate poll batch concurrently; the batch is
+# awaited before the next poll, which bounds the work in flight
+dispatch_executor = ThreadPoolExecutor(
+    max_workers=config["kafka"]["consumer"]["dispatch_workers"]
+)
+
+# Fetch sizing shared by the batch-polling consumers
+FETCH_CONFIG = {
+    "fetch_min_bytes": config["kafka"]["consumer"]["fetch_min_bytes"],
+    "fetch_max_wait_ms": config["kafka"]["consumer"]["fetch_max_wait_ms"],
+    "max_partition_fetch_bytes": config["kafka"]["consumer"][
+        "max_partition_fetch_bytes"
+    ],
+    "max_poll_records": config["kafka"]["consumer"]["max_poll_records"],
+}
+# documents are uploaded one by one, so they are polled in small batches
+DOCUMENT_FETCH_CONFIG = FETCH_CONFIG | {
+    "max_poll_records": config["kafka"]["documents"]["max_poll_records"]
+}
+
 
 class Service:
     def __init__(self):
@@ -27,15 +54,16 @@ class Service:
             config["kafka"]["ingest"]["topic"],
             bootstrap_servers=config["kafka"]["brokers"],
             auto_offset_reset="earliest",
-            enable_auto_commit=True,
+            enable_auto_commit=False,
             group_id=config["kafka"]["ingest"]["group_id"],
-            value_deserializer=lambda x: json.loads(x.decode("utf-8")),
-        )
-        self.redis_client = redis.Redis(
-            host=config["redis"]["host"],
-            port=config["redis"]["port"],
-            db=config["redis"]["multiline"]["db"],
+            # tells the group members apart when several processes share it
+            client_id=f'{config["kafka"]["ingest"]["group_id"]}-{os.getpid()}',
+            value_deserializer=from_json,
+            **FETCH_CONFIG,
         )
+        # one service, and its pooled client, for every message of the consumer
+        self.redis_service = RedisService(config["redis"]["multiline"]["db"])
+        self.redis_client = self.redis_service.redis_client
         self.redis_ttl = config["redis"]["multiline"]["ttl"]
 
     def consume_candidate_messages(self):
@@ -48,127 +76,248 @@ class Service:
                 "[consume_messages] Starting Kafka consumer on %s",
                 self.output_consumer.config["group_id"],
             )
-            for message in self.output_consumer:
-                try:
-                    key = message.key.decode("utf-8")
-                    event = message.value
-                    user_details = get_user_details(
-                        x_user_id=str(event["receiver_id"]), db=get_db()
+            while True:
+                records = self.output_consumer.poll(
+                    timeout_ms=config["kafka"]["consumer"]["poll_timeout_ms"],
+                    max_records=config["kafka"]["consumer"]["max_poll_records"],
+                )
+                # a chat's messages stay in order on one worker while
+                # different chats of the batch are handled side by side
+                chats = {}
+                for messages in records.values():
+                    for message in messages:
+                        chats.setdefault(message.key, []).append(message)
+                futures = [
+                    dispatch_executor.submit(
+                        self.process_candidate_messages, chat_messages
                     )
-                    logger.debug(f"[consume_messages] Received message: {event}")
-                    if event.get("event_type") == "ChatPresence":
-                        if self.redis_client.exists(key):
-                            self.redis_client.expire(key, self.redis_ttl)
-                        continue  # Skip further processing
-                    redis_service = RedisService(config["redis"]["multiline"]["db"])
-                    match event["msg_type"]:
-                        case "document":
-                            document_repository = Repository(get_db())
-                            document_service = DocumentService(document_repository)
-                            # Process documents immediately, no buffering
-                            doc_event = Event(
-                                mid=event.get("mid", shortuuid.uuid()),
-                                timestamp=event.get(
-                                    "timestamp",
-                                    datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                                ),
-                                chat_id=event["chat_id"],
-                                sender_id=event["sender_id"],
-                                receiver_id=event["receiver_id"],
-                                content=event["content"],
-                                msg_type=event["msg_type"],
-                                mime_type=event.get("mime_type", None),
-                            )
-                            document_service.process_document(doc_event)
-                            document_repository.close()
-                        case "audio":
-                            from app.services.audio_service import audio_service
+                    for chat_messages in chats.values()
+                ]
+                # chats whose multiline buffer is kept alive by a presence
+                # event; waiting on every chat also holds the offset commit
+                # until the whole batch has been handled
+                presence_keys = [key for future in futures for key in future.result()]
+                if presence_keys:
+                    # XX only refreshes buffers that still exist, so the whole
+                    # batch goes out in one round trip without an EXISTS check
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    for presence_key in presence_keys:
+                        pipe.expire(presence_key, self.redis_ttl, xx=True)
+                    pipe.execute()
+                if records:
+                    # records produced for the batch, failed-topic copies of
+                    # poisoned messages included, are acked before its offsets
+                    # are committed, so a crash replays rather than drops them
+                    producer.flush()
+                    self.output_consumer.commit_async()
+        except KeyboardInterrupt:
+            self.output_consumer.close()
+        except Exception as e:
+            logger.error(f"[consume_messages] Error consuming messages: {e}")
 
-                            # Transcribe audio before buffering
-                            transcript = audio_service.sarvam_translate(
-                                event["content"]
+    def process_candidate_messages(self, messages: List[ConsumerRecord]) -> List[str]:
+        """
+        Handles one chat's messages from a poll batch, in order.
+        :param messages: The chat's records, in offset order.
+        :return: The keys of the chat's presence events.
+        """
+        presence_keys = []
+        for message in messages:
+            try:
+                key = message.key.decode("utf-8")
+                event = message.value
+                logger.debug("[consume_messages] Received message: %s", event)
+                if event.get("event_type") == "ChatPresence":
+                    presence_keys.append(key)
+                    continue  # Skip further processing
+                user_details = get_cached_user_details(str(event["receiver_id"]))
+                match event["msg_type"]:
+                    case "document":
+                        # Uploads run on the documents consumer; the topic
+                        # keeps them durable and ordered per chat key
+                        producer.send(
+                            topic=config["kafka"]["documents"]["topic"],
+                            key=message.key,
+                            value=event,
+                        )
+                    case "audio":
+                        # Transcribe audio before buffering
+                        if self.transcribe_audio(event):
+                            self.redis_service.multi_line_handler(
+                                key, event, self.redis_ttl
                             )
-                            if not transcript:
+                    case "text":
+                        self.redis_service.multi_line_handler(
+                            key, event, self.redis_ttl
+                        )
+                    case _:
+                        raise MyException(
+                            block="Invalid case match",
+                            error_code=ErrorMessages.MEDIA_NOT_SUPPORTED,
+                            error_message=event.get("content", ""),
+                            error_type=event.get("msg_type", ""),
+                            timestamp=datetime.now().isoformat(),
+                        )
+            except MyException as me:
+                logger.error(f"[consume_messages] Custom exception occurred: {me}")
+                self.send_failure(message, me)
+                self.notify_recruiter(event, key, user_details, me.error_code)
+            except Exception as e:
+                logger.error(f"[consume_messages] Error consuming messages: {e}")
+                self.send_failure(message, e, block="main_consumer")
+        return presence_keys
+
+    def transcribe_audio(self, event: dict) -> bool:
+        """
+        Replaces an audio event's content with its Sarvam transcript.
+        :param event: The audio event, updated in place with content and locale.
+        :return: Whether a transcript was returned.
+        """
+        from app.services.audio_service import audio_service
+
+        transcript = audio_service.sarvam_translate(event["content"])
+        if not transcript:
+            logger.error(
+                "[consume_messages] Transcription failed: No transcript returned"
+            )
+            return False
+        if "error" in transcript:
+            logger.error(
+                f"[consume_messages] Transcription error: {transcript['error']}"
+            )
+            raise MyException(
+                block="sarvam_translate",
+                error_code=ErrorMessages.TRANSCRIPTION_ERROR,
+                error_message=str(transcript),
+                error_type=transcript.get("error", "Unknown"),
+                timestamp=datetime.now().isoformat(),
+            )
+        event["content"] = transcript["transcript"]
+        event["locale"] = transcript["language_code"]
+        return True
+
+    def send_failure(self, message: ConsumerRecord, error: Exception, block: str = ""):
+        """
+        Forwards a record that could not be processed to the failed topic.
+        :param error: The failure; a MyException carries its own details and block.
+        :param block: Where an unexpected exception was caught.
+        """
+        if isinstance(error, MyException):
+            failure = {
+                "error_code": error.error_code,
+                "error_message": error.error_message,
+                "error_type": error.error_type,
+                "timestamp": error.timestamp,
+                "block": error.block,
+            }
+        else:
+            failure = {
+                "error_code": "UNKNOWN_ERROR",
+                "error_message": error.args[0] if error.args else str(error),
+                "error_type": error.__class__.__name__,
+                "timestamp": datetime.now().isoformat(),
+                "block": block,
+            }
+        producer.send(
+            topic=config["kafka"]["failed"]["topic"],
+            key=message.key,
+            value={**failure, "event": message.value},
+        )
+
+    def notify_recruiter(
+        self, event: dict, key: str, user_details: UserDetails, error_code: str
+    ):
+        """
+        Tells a configured recruiter which applicant ran into an error.
+        """
+        if event["receiver_id"] not in RECRUITER_IDS:
+            return
+        send_message(
+            user_details=user_details,
+            applicant_id=event["sender_id"],
+            event=Event(
+                chat_id=f"{event['receiver_id']}@s.whatsapp.net",
+                content=f"user {event['sender_id']} is facing issue: {error_code}",
+                msg_type="text",
+                receiver_id=event["receiver_id"],
+                sender_id=event["receiver_id"],
+            ),
+            key=key,
+        )
+
+    def consume_document_messages(self):
+        """
+        Consumes document events forwarded by the candidate consumer, uploads
+        them and replies to the applicant.
+        This function initializes a Kafka consumer and listens for messages indefinitely.
+        """
+        try:
+            consumer = KafkaConsumer(
+                config["kafka"]["documents"]["topic"],
+                bootstrap_servers=config["kafka"]["brokers"],
+                auto_offset_reset="earliest",
+                enable_auto_commit=False,
+                group_id=config["kafka"]["documents"]["group_id"],
+                value_deserializer=from_json,
+                **DOCUMENT_FETCH_CONFIG,
+            )
+            logger.info(
+                f"[consume_document_messages] Consumer started for topic: {config['kafka']['documents']['topic']} on brokers: {config['kafka']['brokers']}"
+            )
+            while True:
+                records = consumer.poll(
+                    timeout_ms=config["kafka"]["consumer"]["poll_timeout_ms"],
+                    max_records=config["kafka"]["documents"]["max_poll_records"],
+                )
+                if not records:
+                    continue
+                # one session serves every document of the batch, each document
+                # committed or rolled back on its own
+                with session_scope() as db:
+                    document_service = DocumentService(Repository(db))
+                    for messages in records.values():
+                        for message in messages:
+                            try:
+                                key = message.key.decode("utf-8")
+                                event = message.value
+                                user_details = get_cached_user_details(
+                                    str(event["receiver_id"])
+                                )
+                                doc_event = Event(
+                                    # defaults are only built when the bridge omitted them
+                                    mid=event.get("mid") or shortuuid.uuid(),
+                                    timestamp=event.get("timestamp")
+                                    or event_timestamp(),
+                                    chat_id=event["chat_id"],
+                                    sender_id=event["sender_id"],
+                                    receiver_id=event["receiver_id"],
+                                    content=event["content"],
+                                    msg_type=event["msg_type"],
+                                    mime_type=event.get("mime_type", None),
+                                )
+                                document_service.process_document(doc_event)
+                                db.commit()
+                            except MyException as me:
+                                db.rollback()
                                 logger.error(
-                                    "[consume_messages] Transcription failed: No transcript returned"
+                                    f"[consume_document_messages] Custom exception occurred: {me}"
                                 )
-                            else:
-                                if "error" in transcript:
-                                    logger.error(
-                                        f"[consume_messages] Transcription error: {transcript['error']}"
-                                    )
-                                    raise MyException(
-                                        block="sarvam_translate",
-                                        error_code=ErrorMessages.TRANSCRIPTION_ERROR,
-                                        error_message=str(transcript),
-                                        error_type=transcript.get("error", "Unknown"),
-                                        timestamp=datetime.now().isoformat(),
-                                    )
-                                event["content"] = transcript["transcript"]
-                                event["locale"] = transcript["language_code"]
-                                redis_service.multi_line_handler(
-                                    key, event, self.redis_ttl
+                                self.send_failure(message, me)
+                                self.notify_recruiter(
+                                    event, key, user_details, me.error_code
                                 )
-                        case "text":
-                            redis_service.multi_line_handler(key, event, self.redis_ttl)
-                        case _:
-                            raise MyException(
-                                block="Invalid case match",
-                                error_code=ErrorMessages.MEDIA_NOT_SUPPORTED,
-                                error_message=event.get("content", ""),
-                                error_type=event.get("msg_type", ""),
-                                timestamp=datetime.now().isoformat(),
-                            )
-                except MyException as me:
-                    logger.error(f"[consume_messages] Custom exception occurred: {me}")
-                    producer.send(
-                        topic=config["kafka"]["failed"]["topic"],
-                        key=key.encode("utf-8") if key else None,
-                        value={
-                            "error_code": me.error_code,
-                            "error_message": me.error_message,
-                            "error_type": me.error_type,
-                            "timestamp": me.timestamp,
-                            "block": me.block,
-                            "event": event,
-                        },
-                    )
-                    response_event = Event(
-                        mid=shortuuid.uuid(),
-                        chat_id=f"{event['receiver_id']}@s.whatsapp.net",
-                        content=f"user {event['sender_id']} is facing issue: {me.error_code}",
-                        msg_type="text",
-                        receiver_id=event["receiver_id"],
-                        sender_id=event["receiver_id"],
-                        timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    )
-                    for recruiter_config in config["whatsapp"]:
-                        if recruiter_config["recruiter_id"] == event["receiver_id"]:
-                            send_message(
-                                user_details=user_details,
-                                applicant_id=event["sender_id"],
-                                event=response_event,
-                                key=key,
-                            )
-                            break
-                except Exception as e:
-                    logger.error(f"[consume_messages] Error consuming messages: {e}")
-                    producer.send(
-                        topic=config["kafka"]["failed"]["topic"],
-                        key=key.encode("utf-8") if key else None,
-                        value={
-                            "error_code": "UNKNOWN_ERROR",
-                            "error_message": e.args[0] if e.args else str(e),
-                            "error_type": e.__class__.__name__,
-                            "timestamp": datetime.now().isoformat(),
-                            "block": "main_consumer",
-                            "event": event,
-                        },
-                    )
+                            except Exception as e:
+                                db.rollback()
+                                logger.error(
+                                    f"[consume_document_messages] Error consuming messages: {e}"
+                                )
+                                self.send_failure(message, e, block="document_consumer")
+                producer.flush()
+                consumer.commit_async()
         except KeyboardInterrupt:
-            self.output_consumer.close()
+            consumer.close()
         except Exception as e:
-            logger.error(f"[consume_messages] Error consuming messages: {e}")
+            logger.error(f"[consume_document_messages] Error consuming messages: {e}")
 
     def consume_admin_messages(self):
         """
@@ -180,76 +329,52 @@ class Service:
                 config["kafka"]["admin"]["topic"],
                 bootstrap_servers=config["kafka"]["brokers"],
                 auto_offset_reset="earliest",
-                enable_auto_commit=True,
+                enable_auto_commit=False,
                 group_id=config["kafka"]["admin"]["group_id"],
-                value_deserializer=lambda x: json.loads(x.decode("utf-8")),
+                value_deserializer=from_json,
+                **FETCH_CONFIG,
             )
             logger.info(
                 f"[consume_admin_messages] Consumer started for topic: {config['kafka']['admin']['topic']} on brokers: {config['kafka']['brokers']}"
             )
             from app.services.command_service import command_service
 
-            for message in consumer:
-                try:
-                    event = message.value
-                    user_details = get_user_details(
-                        x_user_id=str(event["receiver_id"]), db=get_db()
-                    )
-                    key = message.key.decode("utf-8")
-                    logger.info(
-                        f"[consume_admin_messages] Received message: {event} with key: {key}"
-                    )
-                    command_service.parse_command(event, key)
-                except MyException as me:
-                    logger.error(
-                        f"[consume_admin_messages] Custom exception occurred: {me}"
-                    )
-                    producer.send(
-                        topic=config["kafka"]["failed"]["topic"],
-                        key=key.encode("utf-8") if key else None,
-                        value={
-                            "error_code": me.error_code,
-                            "error_message": me.error_message,
-                            "error_type": me.error_type,
-                            "timestamp": me.timestamp,
-                            "block": me.block,
-                            "event": event,
-                        },
-                    )
-                    response_event = Event(
-                        mid=shortuuid.uuid(),
-                        chat_id=f"{event['receiver_id']}@s.whatsapp.net",
-                        content=f"user {event['sender_id']} is facing issue: {me.error_code}",
-                        msg_type="text",
-                        receiver_id=event["receiver_id"],
-                        sender_id=event["receiver_id"],
-                        timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    )
-                    for recruiter_config in config["whatsapp"]:
-                        if recruiter_config["recruiter_id"] == event["receiver_id"]:
-                            send_message(
-                                user_details=user_details,
-                                applicant_id=event["sender_id"],
-                                event=response_event,
-                                key=key,
+            while True:
+                records = consumer.poll(
+                    timeout_ms=config["kafka"]["consumer"]["poll_timeout_ms"],
+                    max_records=config["kafka"]["consumer"]["max_poll_records"],
+                )
+                for messages in records.values():
+                    for message in messages:
+                        try:
+                            event = message.value
+                            user_details = get_cached_user_details(
+                                str(event["receiver_id"])
                             )
-                            break
-                except Exception as e:
-                    logger.error(
-                        f"[consume_admin_messages] Error consuming messages: {e}"
-                    )
-                    producer.send(
-                        topic=config["kafka"]["failed"]["topic"],
-                        key=key.encode("utf-8") if key else None,
-                        value={
-                            "error_code": "UNKNOWN_ERROR",
-                            "error_message": e.args[0] if e.args else str(e),
-                            "error_type": e.__class__.__name__,
-                            "timestamp": datetime.now().isoformat(),
-                            "block": "main_consumer",
-                            "event": event,
-                        },
-                    )
+                            key = message.key.decode("utf-8")
+                            logger.info(
+                                f"[consume_admin_messages] Received message: {event} with key: {key}"
+                            )
+                            command_service.parse_command(event, key)
+                        except MyException as me:
+                            logger.error(
+                                f"[consume_admin_messages] Custom exception occurred: {me}"
+                            )
+                            self.send_failure(message, me)
+                            self.notify_recruiter(
+                                event, key, user_details, me.error_code
+                            )
+                        except Exception as e:
+                            logger.error(
+                                f"[consume_admin_messages] Error consuming messages: {e}"
+                            )
+                            self.send_failure(message, e, block="main_consumer")
+                if records:
+                    # records produced for the batch, failed-topic copies of
+                    # poisoned messages included, are acked before its offsets
+                    # are committed, so a crash replays rather than drops them
+                    producer.flush()
+                    consumer.commit_async()
         except KeyboardInterrupt:
             consumer.close()
         except Exception as e:
@@ -1,6 +1,7 @@
 from uuid import uuid4
 from datetime import datetime
 
+from pydantic import TypeAdapter
 from pydantic_core import ValidationError
 from fastapi import status as http_status, HTTPException
 
@@ -15,7 +16,7 @@ from app.repositories.action_details import Repository as ActionsRepository
 
 from app.models.configs import Model as Config
 from app.models.user_login import UserDetails, Role
-from app.models.applicants import Model as Applicant, Request as ApplicantRequest
+from app.models.applicants import Model as Applicant
 from app.models.recruiter_lists import Model as ListModel
 from app.models.action_details import Model as DetailModel, Status as DetailStatus
 from app.models.list_actions import (
@@ -35,6 +36,10 @@ from app.models.list_actions import (
 from app.services.redis_service import Service as RedisService
 from app.services.applicants import Service as ApplicantsService
 
+MODELS_ADAPTER = TypeAdapter(list[Model])
+APPLICANTS_ADAPTER = TypeAdapter(list[Applicant])
+DETAILS_ADAPTER = TypeAdapter(list[DetailModel])
+
 
 class Service:
     def __init__(self, repo: Repository):
@@ -74,7 +79,7 @@ class Service:
                 detail="No actions found",
             )
         return Response(
-            data=[Model.model_validate(table) for table in tables],
+            data=MODELS_ADAPTER.validate_python(tables, from_attributes=True),
             mid=uuid4(),
             ts=datetime.now(),
         )
@@ -114,7 +119,7 @@ class Service:
                 detail="No actions found",
             )
         return Response(
-            data=[Model.model_validate(table) for table in tables],
+            data=MODELS_ADAPTER.validate_python(tables, from_attributes=True),
             mid=uuid4(),
             ts=datetime.now(),
         )
@@ -132,7 +137,7 @@ class Service:
                 detail="No actions found",
             )
         return Response(
-            data=[Model.model_validate(table) for table in tables],
+            data=MODELS_ADAPTER.validate_python(tables, from_attributes=True),
             mid=uuid4(),
             ts=datetime.now(),
         )
@@ -152,7 +157,7 @@ class Service:
                 detail="No actions found",
             )
         return Response(
-            data=[Model.model_validate(table) for table in tables],
+            data=MODELS_ADAPTER.validate_python(tables, from_attributes=True),
             mid=uuid4(),
             ts=datetime.now(),
         )
@@ -174,7 +179,7 @@ class Service:
                 detail="No actions found",
             )
         return Response(
-            data=[Model.model_validate(table) for table in tables],
+            data=MODELS_ADAPTER.validate_python(tables, from_attributes=True),
             mid=uuid4(),
             ts=datetime.now(),
         )
@@ -193,40 +198,17 @@ class Service:
                 status_code=http_status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to access this list",
             )
-        no_change = set(_list.applicants).intersection(  # type: ignore
-            set(body.request.applicants or [])
+        current = set(_list.applicants or [])
+        requested = set(body.request.applicants or [])
+        no_change = current & requested
+        added = requested - current
+        applicant_service = ApplicantsService(self.applicants_repo)
+        failed = applicant_service.add_tag(
+            user_details=user_details,
+            applicant_ids=list(added),
+            tag=_list.list_name,
         )
-        added = set(body.request.applicants or []) - no_change
-        failed = []
-        for applicant_id in list(added):
-            applicant_service = ApplicantsService(self.applicants_repo)
-            try:
-                exists = applicant_service.get_by_recruiter_and_applicant(
-                    user_details=user_details, applicant_id=applicant_id
-                )
-            except HTTPException as e:
-                if e.status_code == http_status.HTTP_404_NOT_FOUND:
-                    exists = None
-                else:
-                    raise
-            if exists:
-                applicant_service.update_tags(
-                    user_details=user_details,
-                    applicant_id=applicant_id,
-                    tags=[_list.list_name],
-                )
-            else:
-                applicant = ApplicantRequest(
-                    applicant_id=applicant_id, tags=[_list.list_name]
-                )
-                try:
-                    applicant_service.create(user_details=user_details, body=applicant)
-                except HTTPException as e:
-                    if e.status_code == http_status.HTTP_422_UNPROCESSABLE_ENTITY:
-                        added.remove(applicant_id)
-                        failed.append(applicant_id)
-                    else:
-                        raise
+        added -= set(failed)
         data = []
         if no_change:
             data.append(
@@ -240,13 +222,14 @@ class Service:
             )
         if failed:
             data.append(ListActionStatusItem(status=Status.FAILED, applicants=failed))
-        updated = list(set(_list.applicants).union(added))  # type: ignore
-        update = self.lists_repo.update(id=id, applicants=updated)
-        if update is None:
-            raise HTTPException(
-                status_code=http_status.HTTP_404_NOT_FOUND,
-                detail="List not found",
-            )
+        # a resubmitted list leaves the row untouched, only the audit is kept
+        if added:
+            update = self.lists_repo.update(id=id, applicants=list(current | added))
+            if update is None:
+                raise HTTPException(
+                    status_code=http_status.HTTP_404_NOT_FOUND,
+                    detail="List not found",
+                )
         model = Model(
             list_id=id,
             action_type=Actions.ADD,
@@ -277,9 +260,10 @@ class Service:
                 status_code=http_status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to access this list",
             )
-        updated = set(_list.applicants).intersection(set(body.request.applicants or []))  # type: ignore
-        no_change = set(body.request.applicants or []) - updated
-        new_list = set(_list.applicants) - updated  # type: ignore
+        current = set(_list.applicants or [])
+        requested = set(body.request.applicants or [])
+        updated = current & requested
+        no_change = requested - current
         for applicant_id in list(updated):
             exists = self.applicants_repo.get_by_recruiter_and_applicant(
                 recruiter_id=user_details.id, applicant_id=applicant_id
@@ -297,12 +281,13 @@ class Service:
             ListActionStatusItem(status=Status.NO_CHANGE, applicants=list(no_change)),
             ListActionStatusItem(status=Status.COMPLETED, applicants=list(updated)),
         ]
-        update = self.lists_repo.update(id=id, applicants=list(new_list))
-        if update is None:
-            raise HTTPException(
-                status_code=http_status.HTTP_404_NOT_FOUND,
-                detail="List not found",
-            )
+        if updated:
+            update = self.lists_repo.update(id=id, applicants=list(current - updated))
+            if update is None:
+                raise HTTPException(
+                    status_code=http_status.HTTP_404_NOT_FOUND,
+                    detail="List not found",
+                )
         model = Model(
             list_id=id,
             action_type=Actions.REMOVE,
@@ -332,35 +317,28 @@ class Service:
                 status_code=http_status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to access this list",
             )
-        updated = []
+        configs = {}
         no_change = []
         for applicant in body.request.applicants:
-            config = self.config_repo.get_by_recruiter_and_applicant(
-                recruiter_id=user_details.id, applicant_id=applicant
-            )
-            if not config:
-                try:
-                    config = Config(
-                        recruiter_id=user_details.id,
-                        applicant_id=applicant,
-                        enabled=False,
-                        updated_by=str(user_details.id),
-                    )  # type: ignore
-                except ValidationError as e:
-                    no_change.append(applicant)
-                    continue
-                self.config_repo.create(config)
-                updated.append(applicant)
-            elif Config.model_validate(config).enabled:
-                self.config_repo.update_enabled(
+            try:
+                configs[applicant] = Config(
                     recruiter_id=user_details.id,
                     applicant_id=applicant,
                     enabled=False,
                     updated_by=str(user_details.id),
-                )
-                updated.append(applicant)
-            else:
+                )  # type: ignore
+            except ValidationError as e:
                 no_change.append(applicant)
+        # inserts the missing configs and disables the enabled ones in one
+        # statement; configs already disabled are not returned
+        updated = (
+            self.config_repo.disable_many(
+                models=list(configs.values()), updated_by=str(user_details.id)
+            )
+            if configs
+            else []
+        )
+        no_change.extend(set(configs) - set(updated))
         data = [
             ListActionStatusItem(status=Status.NO_CHANGE, applicants=list(no_change)),
             ListActionStatusItem(status=Status.COMPLETED, applicants=list(updated)),
@@ -456,7 +434,9 @@ class Service:
             recruiter_id=user_details.id,
             applicant_ids=model.applicants,
         )
-        applicants = [Applicant.model_validate(applicant) for applicant in applicants]
+        applicants = APPLICANTS_ADAPTER.validate_python(
+            applicants, from_attributes=True
+        )
         logger.info(f"Found applicants for nudge: {applicants}")
         for applicant in applicants:
             if applicant.response:
@@ -497,24 +477,29 @@ class Service:
                 detail="Not authorized to access this list",
             )
         details = self.actions_repo.get_all(id=action_id)
-        details = [DetailModel.model_validate(detail) for detail in details]
-        for detail in details:
-            if detail.status == DetailStatus.SCHEDULED:
-                self.redis_service.cancel_action(applicant_id=detail.applicant_id)
-            if detail.status not in [
-                DetailStatus.COMPLETED,
-                DetailStatus.CANCELLED,
-                DetailStatus.FAILED,
-            ]:
-                self.actions_repo.update(id=detail.id, status=DetailStatus.CANCELLED)  # type: ignore
+        details = DETAILS_ADAPTER.validate_python(details, from_attributes=True)
+        self.redis_service.cancel_actions(
+            applicant_ids=[
+                detail.applicant_id
+                for detail in details
+                if detail.status == DetailStatus.SCHEDULED
+            ]
+        )
+        # one UPDATE ... RETURNING flips the unfinished details; the response
+        # patches them into the details read above instead of re-reading all
+        cancelled = {
+            detail.id: detail
+            for detail in DETAILS_ADAPTER.validate_python(
+                self.actions_repo.cancel_pending(action_id=action_id),
+                from_attributes=True,
+            )
+        }
         action = self.repo.get(id=action_id)
         action = Model.model_validate(action)
         if action.status not in [Status.COMPLETED, Status.CANCELLED, Status.FAILED]:
             self.repo.update(id=action.id, status=Status.CANCELLED)  # type: ignore
-        details = self.actions_repo.get_all(id=action_id)
-        details = [DetailModel.model_validate(detail) for detail in details]
         return CancelResponse(
             mid=uuid4(),
             ts=datetime.now(),
-            data=details,
+            data=[cancelled.get(detail.id, detail) for detail in details],
         )
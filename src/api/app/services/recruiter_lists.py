@@ -1,21 +1,21 @@
 from uuid import uuid4
 from datetime import datetime
 
+from pydantic import TypeAdapter
 from fastapi import HTTPException, status as http_status
 
-from app.db.postgres import get_db
-
 from app.core.logger import logger
 
 from app.repositories.recruiter_lists import Repository
 from app.repositories.applicants import Repository as ApplicantsRepository
 
 from app.models.user_login import UserDetails
-from app.models.applicants import Request as ApplicantRequest
 from app.models.recruiter_lists import Model, Request, Response, Status, NameRequest
 
 from app.services.applicants import Service as ApplicantsService
 
+MODELS_ADAPTER = TypeAdapter(list[Model])
+
 
 class Service:
     def __init__(self, repo: Repository):
@@ -31,49 +31,14 @@ class Service:
                 status_code=http_status.HTTP_409_CONFLICT,
                 detail="List name already exists",
             )
-        applicants_repo = ApplicantsRepository(get_db())
-        applicant_service = ApplicantsService(applicants_repo)
+        applicant_service = ApplicantsService(ApplicantsRepository(self.repo.db))
         applicants = set(body.request.applicants or [])
-        for applicant_id in body.request.applicants or []:
-            try:
-                exists = applicant_service.get_by_recruiter_and_applicant(
-                    user_details=user_details, applicant_id=applicant_id
-                )
-            except HTTPException as e:
-                if e.status_code == http_status.HTTP_404_NOT_FOUND:
-                    logger.warning(
-                        f"Applicant {applicant_id} not found for recruiter {user_details.id}"
-                    )
-                    exists = None
-                else:
-                    raise
-            if exists:
-                logger.info(
-                    f"Applicant {applicant_id} found for recruiter {user_details.id}"
-                )
-                applicant_service.update_tags(
-                    user_details=user_details,
-                    applicant_id=applicant_id,
-                    tags=[body.request.list_name],
-                )
-            else:
-                applicant = ApplicantRequest(
-                    applicant_id=applicant_id, tags=[body.request.list_name]
-                )
-                try:
-                    applicant_service.create(user_details=user_details, body=applicant)
-                except HTTPException as e:
-                    if e.status_code == http_status.HTTP_422_UNPROCESSABLE_ENTITY:
-                        logger.warning(
-                            f"Applicant {applicant_id} could not be created for recruiter {user_details.id}"
-                        )
-                        applicants.remove(applicant_id)
-                    else:
-                        raise
-                logger.info(
-                    f"Applicant {applicant_id} created for recruiter {user_details.id}"
-                )
-        applicants_repo.close()
+        failed = applicant_service.add_tag(
+            user_details=user_details,
+            applicant_ids=list(applicants),
+            tag=body.request.list_name,
+        )
+        applicants -= set(failed)
         model = Model(
             recruiter_id=user_details.id,
             list_name=body.request.list_name,
@@ -98,7 +63,7 @@ class Service:
             raise HTTPException(
                 status_code=http_status.HTTP_404_NOT_FOUND, detail="No lists found"
             )
-        data = [Model.model_validate(table) for table in tables]
+        data = MODELS_ADAPTER.validate_python(tables, from_attributes=True)
         return Response(
             data=data,
             mid=uuid4(),
@@ -149,7 +114,7 @@ class Service:
                 status_code=http_status.HTTP_404_NOT_FOUND, detail="No lists found"
             )
         return Response(
-            data=[Model.model_validate(table) for table in tables],
+            data=MODELS_ADAPTER.validate_python(tables, from_attributes=True),
             mid=uuid4(),
             ts=datetime.now(),
         )
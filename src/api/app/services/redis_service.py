@@ -1,11 +1,11 @@
 import json
 from copy import deepcopy
+from functools import lru_cache
 from typing import List
 from random import randrange
 from datetime import datetime
 
 import redis
-import shortuuid
 
 from app.db.postgres import get_db
 
@@ -29,6 +29,17 @@ from app.services.util_service import send_message
 from app.services.text_service import text_service
 
 
+@lru_cache(maxsize=None)
+def get_redis_client(db: int) -> redis.Redis:
+    """
+    Shared client per logical database, so every service instance draws from
+    one connection pool instead of opening its own.
+    """
+    return redis.Redis(
+        host=config["redis"]["host"], port=config["redis"]["port"], db=db
+    )
+
+
 class Service:
     """
     Service for scheduling and handling message events using Redis.
@@ -49,9 +60,7 @@ class Service:
         Args:
             db: SQLAlchemy session for persisting action details.
         """
-        self.redis_client: redis.Redis = redis.Redis(
-            host=config["redis"]["host"], port=config["redis"]["port"], db=db
-        )
+        self.redis_client: redis.Redis = get_redis_client(db)
         self.min_wait = config["redis"]["schedule_send"]["min_wait"]
         self.max_wait = config["redis"]["schedule_send"]["max_wait"]
         self.db = db
@@ -107,15 +116,24 @@ class Service:
         logger.debug("Latest timestamp for scheduling: %s", latest_ts)
         updated = []
         no_change = []
+        details = []
 
-        for applicant in applicants:
-            try:
-                exists = self.redis_client.get(f"{applicant}_bk")
-            except Exception:
-                logger.exception(
-                    "Failed to GET schedule bk for applicant=%s", applicant
+        # one MGET for the existing schedules and one pipeline for the new
+        # keys instead of a GET and three SETs per applicant
+        try:
+            existing = dict(
+                zip(
+                    applicants,
+                    self.redis_client.mget([f"{a}_bk" for a in applicants]),
                 )
-                exists = None
+            )
+        except Exception:
+            logger.exception("Failed to MGET schedule bk for applicants")
+            existing = {}
+        pipe = self.redis_client.pipeline(transaction=False)
+
+        for applicant in applicants:
+            exists = existing.get(applicant)
 
             if not exists:
                 gap = randrange(self.min_wait, self.max_wait)
@@ -127,7 +145,6 @@ class Service:
                     latest_ts,
                 )
                 event = Event(
-                    mid=shortuuid.uuid(),
                     timestamp=datetime.fromtimestamp(float(latest_ts)).strftime(
                         "%Y-%m-%dT%H:%M:%SZ"
                     ),
@@ -141,26 +158,11 @@ class Service:
                     "action_id": action_id,
                     "event": event.model_dump(exclude_none=True),
                 }
-                try:
-                    self.redis_client.set(
-                        str(applicant) + "_bk",
-                        json.dumps(data).encode("utf-8"),
-                    )
-                    ttl = latest_ts - current_ts
-                    self.redis_client.setex(
-                        str(applicant),
-                        ttl,
-                        "",
-                    )
-                    self.redis_client.set(
-                        "latest",
-                        latest_ts,
-                    )
-                except Exception:
-                    logger.exception(
-                        "Failed to set schedule keys for applicant=%s",
-                        applicant,
-                    )
+                payload = json.dumps(data).encode("utf-8")
+                pipe.set(str(applicant) + "_bk", payload)
+                pipe.setex(str(applicant), latest_ts - current_ts, "")
+                # a repeated applicant sees its own schedule as existing
+                existing[applicant] = payload
 
                 detail = Model(
                     action_id=action_id,
@@ -187,19 +189,33 @@ class Service:
                     additional_config={"exists": exists.decode("utf-8")},  # type: ignore
                 )
                 no_change.append(applicant)
-            try:
-                actions_repo = Repository(get_db())
-                table = actions_repo.create(detail)
+            details.append(detail)
 
-                actions_repo.close()
+        if updated:
+            pipe.set("latest", latest_ts)
+            try:
+                pipe.execute()
             except Exception:
                 logger.exception(
-                    "Failed to persist action detail: action_id=%s applicant_id=%s status=%s",
-                    action_id,
-                    detail.applicant_id,
-                    detail.status,
+                    "Failed to set schedule keys for action_id=%s", action_id
                 )
 
+        actions_repo = Repository(get_db())
+        try:
+            for detail in details:
+                try:
+                    actions_repo.create(detail)
+                except Exception:
+                    actions_repo.db.rollback()
+                    logger.exception(
+                        "Failed to persist action detail: action_id=%s applicant_id=%s status=%s",
+                        action_id,
+                        detail.applicant_id,
+                        detail.status,
+                    )
+        finally:
+            actions_repo.close()
+
         result = []
         if updated:
             result.append(
@@ -290,8 +306,6 @@ class Service:
                     event["content"] = content
                     logger.info("Dispatching event for key=%s", expired_key)
                     typing_event = Event(
-                        mid=shortuuid.uuid(),
-                        timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
                         msg_type="typing",
                         sender_id=event["receiver_id"],
                         receiver_id=event["sender_id"],
@@ -407,9 +421,17 @@ class Service:
                     "[multi_line_handler] Failed to create buffer for key=%s", key
                 )
 
-    def cancel_action(self, applicant_id: int):
-        exists = self.redis_client.delete(f"{applicant_id}_bk", str(applicant_id))
-        if exists:
-            logger.info("Cancelled action for applicant %s", applicant_id)
-        else:
-            logger.warning("No active action found for applicant %s", applicant_id)
+    def cancel_actions(self, applicant_ids: List[int]):
+        """
+        Drop the pending schedules of the given applicants in one round trip.
+        """
+        if not applicant_ids:
+            return
+        pipe = self.redis_client.pipeline(transaction=False)
+        for applicant_id in applicant_ids:
+            pipe.delete(f"{applicant_id}_bk", str(applicant_id))
+        for applicant_id, exists in zip(applicant_ids, pipe.execute()):
+            if exists:
+                logger.info("Cancelled action for applicant %s", applicant_id)
+            else:
+                logger.warning("No active action found for applicant %s", applicant_id)
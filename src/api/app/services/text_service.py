@@ -7,7 +7,7 @@ import shortuuid
 from openai import AzureOpenAI
 from fastapi import HTTPException
 
-from app.db.postgres import get_db
+from app.db.postgres import session_scope
 
 from app.core.constants import *
 from app.core.config import config
@@ -21,7 +21,7 @@ from app.services.documents import Service as DocumentService
 from app.services.applicants import Service as ApplicantService
 from app.services.conversations import Service as ConversationService
 
-from app.models.utils import Event
+from app.models.utils import Event, event_timestamp
 from app.models.user_login import UserDetails, Role
 from app.models.applicants import Model as ApplicantModel, Status as ApplicantStatus
 from app.models.llm import (
@@ -37,6 +37,33 @@ from app.repositories.applicants import Repository as ApplicantsRepository
 from app.repositories.conversations import Repository as ConversationRepository
 
 
+# Structured-output schemas and prompts are fixed for the process lifetime
+BASIC_DETAILS_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "ApplicantSchema",
+        "schema": BasicDetails.model_json_schema(),
+    },
+}
+INTENT_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "ApplicantSchema",
+        "schema": IntentModel.model_json_schema(),
+    },
+}
+INTERRUPT_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "ApplicantSchema",
+        "schema": InterruptModel.model_json_schema(),
+    },
+}
+GATHER_BASIC_DETAILS_PROMPT = config["llm"]["gather_basic_details"]["prompt"]
+EXTRACT_INTENT_PROMPT = config["llm"]["extract_intent"]["prompt"]
+INTERRUPT_HANDLER_PROMPT = config["llm"]["interrupt_handler"]["prompt"]
+
+
 class TextService:
     """
     Service class for handling text-based interactions with applicants.
@@ -172,38 +199,20 @@ class TextService:
         )
 
         try:
-            # Initialize a new Azure OpenAI client for this operation
-            logger.debug(
-                "[TextService.get_basic_details] Initializing Azure OpenAI client"
-            )
-            client = AzureOpenAI(
-                api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-                azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", ""),
-                azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
-                api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-            )
-
             # Prepare the LLM schema for structured output
             logger.debug("[TextService.get_basic_details] Setting up LLM schema")
-            llm_schema = {
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "ApplicantSchema",
-                    "schema": BasicDetails.model_json_schema(),
-                },
-            }
+            llm_schema = BASIC_DETAILS_SCHEMA
 
             # Get system prompt and conversation history
-            system_prompt = self.config["llm"]["gather_basic_details"]["prompt"]
+            system_prompt = GATHER_BASIC_DETAILS_PROMPT
             logger.debug(
                 "[TextService.get_basic_details] Fetching conversation history"
             )
-            conversation_repo = ConversationRepository(get_db())
-            conversation_service = ConversationService(conversation_repo)
-            history = conversation_service.get_history(
-                user_details, applicant_id=applicant.applicant_id
-            )
-            conversation_repo.close()
+            with session_scope() as db:
+                conversation_service = ConversationService(ConversationRepository(db))
+                history = conversation_service.get_history(
+                    user_details, applicant_id=applicant.applicant_id
+                )
             history = [{"role": i.role, "content": i.content} for i in history]
 
             # Prepare current applicant data
@@ -220,7 +229,7 @@ class TextService:
             logger.info(
                 "[TextService.get_basic_details] Sending request to Azure OpenAI"
             )
-            completion = client.chat.completions.create(
+            completion = self.client.chat.completions.create(
                 model="gpt-4.1",
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -242,63 +251,59 @@ class TextService:
             # Parse AI response
             content = completion.choices[0].message.content or ""
             logger.debug("[TextService.get_basic_details] Processing AI response")
-            data = BasicDetails.model_validate(json.loads(content))
+            data = BasicDetails.model_validate_json(content)
 
             # Update applicant details
             logger.info("[TextService.get_basic_details] Updating applicant details")
-            applicant_repo = ApplicantsRepository(get_db())
-            applicant_service = ApplicantService(applicant_repo)
-            applicant_service.update_details(
-                user_details=user_details,
-                applicant_id=applicant.applicant_id,
-                details=data.updated_data.model_dump(exclude_none=True),
-            )
+            with session_scope() as db:
+                applicant_service = ApplicantService(ApplicantsRepository(db))
+                applicant_service.update_details(
+                    user_details=user_details,
+                    applicant_id=applicant.applicant_id,
+                    details=data.updated_data.model_dump(exclude_none=True),
+                )
 
-            # Update applicant status based on completeness
-            new_status = (
-                ApplicantStatus.DETAILS_COMPLETED
-                if data.next_step == BasicDetailsSteps.REQUEST_RESUME
-                else ApplicantStatus.INITIATED
-                if data.next_step == BasicDetailsSteps.ASK_AGE
-                else ApplicantStatus.DETAILS_IN_PROGRESS
-            )
-            if new_status == ApplicantStatus.DETAILS_COMPLETED:
-                document_repo = DocumentRepository(get_db())
-                document_service = DocumentService(document_repo)
-                try:
-                    document = document_service.get_by_recruiter_applicant(
+                # Update applicant status based on completeness
+                new_status = (
+                    ApplicantStatus.DETAILS_COMPLETED
+                    if data.next_step == BasicDetailsSteps.REQUEST_RESUME
+                    else ApplicantStatus.INITIATED
+                    if data.next_step == BasicDetailsSteps.ASK_AGE
+                    else ApplicantStatus.DETAILS_IN_PROGRESS
+                )
+                if new_status == ApplicantStatus.DETAILS_COMPLETED:
+                    document_service = DocumentService(DocumentRepository(db))
+                    try:
+                        document = document_service.get_by_recruiter_applicant(
+                            user_details=user_details,
+                            recruiter_id=user_details.id,
+                            applicant_id=applicant.applicant_id,
+                        )
+                    except HTTPException as e:
+                        document = None
+                    if document:
+                        data.response_to_user = ALL_DETAILS_RESUME_RECEIVED
+                # Create event for conversation tracking
+                logger.debug("[TextService.get_basic_details] Creating conversation event")
+                event = Event(
+                    chat_id=f"{applicant.applicant_id}@s.whatsapp.net",
+                    content=data.response_to_user,
+                    msg_type="text",
+                    receiver_id=applicant.applicant_id,
+                    sender_id=user_details.id,
+                )
+
+                # update status if required
+                if applicant.status != new_status:
+                    logger.info(
+                        f"[TextService.get_basic_details] Updating applicant status to: {new_status}"
+                    )
+
+                    applicant_service.update_status(
                         user_details=user_details,
-                        recruiter_id=user_details.id,
                         applicant_id=applicant.applicant_id,
+                        status=new_status,
                     )
-                except HTTPException as e:
-                    document = None
-                if document:
-                    data.response_to_user = ALL_DETAILS_RESUME_RECEIVED
-            # Create event for conversation tracking
-            logger.debug("[TextService.get_basic_details] Creating conversation event")
-            event = Event(
-                chat_id=f"{applicant.applicant_id}@s.whatsapp.net",
-                content=data.response_to_user,
-                msg_type="text",
-                receiver_id=applicant.applicant_id,
-                sender_id=user_details.id,
-                timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                mid=shortuuid.uuid(),
-            )
-
-            # update status if required
-            if applicant.status != new_status:
-                logger.info(
-                    f"[TextService.get_basic_details] Updating applicant status to: {new_status}"
-                )
-
-                applicant_service.update_status(
-                    user_details=user_details,
-                    applicant_id=applicant.applicant_id,
-                    status=new_status,
-                )
-            applicant_repo.close()
 
             # Send message response
             logger.debug("[TextService.get_basic_details] Sending message response")
@@ -309,29 +314,30 @@ class TextService:
                 key=f"{user_details.id}_{applicant.applicant_id}",
             )
             if new_status == ApplicantStatus.DETAILS_COMPLETED:
-                try:
-                    matching_jobs = job_service.get_matching_jobs(
-                        user_details, applicant.applicant_id
-                    )
-                    job_service.offer_new_job(
-                        user_details=user_details, applicant_id=applicant.applicant_id
-                    )
-                except Exception as e:
-                    event = Event(
-                        chat_id=f"{applicant.applicant_id}@s.whatsapp.net",
-                        content=NO_JOB_OFFERS_MESSAGE,
-                        msg_type="text",
-                        receiver_id=applicant.applicant_id,
-                        sender_id=user_details.id,
-                        timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                        mid=shortuuid.uuid(),
-                    )
-                    send_message(
-                        user_details=user_details,
-                        applicant_id=applicant.applicant_id,
-                        event=event,
-                        key=f"{user_details.id}_{applicant.applicant_id}",
-                    )
+                with session_scope() as db:
+                    try:
+                        matching_jobs = job_service.get_matching_jobs(
+                            user_details, applicant.applicant_id, db=db
+                        )
+                        job_service.offer_new_job(
+                            user_details=user_details,
+                            applicant_id=applicant.applicant_id,
+                            db=db,
+                        )
+                    except Exception as e:
+                        event = Event(
+                            chat_id=f"{applicant.applicant_id}@s.whatsapp.net",
+                            content=NO_JOB_OFFERS_MESSAGE,
+                            msg_type="text",
+                            receiver_id=applicant.applicant_id,
+                            sender_id=user_details.id,
+                        )
+                        send_message(
+                            user_details=user_details,
+                            applicant_id=applicant.applicant_id,
+                            event=event,
+                            key=f"{user_details.id}_{applicant.applicant_id}",
+                        )
             logger.info(
                 f"[TextService.get_basic_details] Successfully processed basic details for applicant {applicant.applicant_id}"
             )
@@ -369,27 +375,10 @@ class TextService:
         )
 
         try:
-            # Initialize Azure OpenAI client
-            logger.debug(
-                "[TextService.extract_intent] Initializing Azure OpenAI client"
-            )
-            client = AzureOpenAI(
-                api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-                azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", ""),
-                azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
-                api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-            )
-
             # Prepare LLM schema for intent classification
-            llm_schema = {
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "ApplicantSchema",
-                    "schema": IntentModel.model_json_schema(),
-                },
-            }
+            llm_schema = INTENT_SCHEMA
 
-            system_prompt = self.config["llm"]["extract_intent"]["prompt"]
+            system_prompt = EXTRACT_INTENT_PROMPT
 
             # history = self.conversation_service.get_history(
             #     user_details, applicant_id=applicant.applicant_id
@@ -410,7 +399,7 @@ class TextService:
             logger.debug(
                 "[TextService.extract_intent] Sending intent extraction request to Azure OpenAI"
             )
-            completion = client.chat.completions.create(
+            completion = self.client.chat.completions.create(
                 model="gpt-4.1",
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -430,7 +419,7 @@ class TextService:
 
             # Parse response
             content = completion.choices[0].message.content or ""
-            data = IntentModel.model_validate(json.loads(content))
+            data = IntentModel.model_validate_json(content)
 
             logger.info(
                 f"[TextService.extract_intent] Intent extracted successfully: {data.classification} for applicant {applicant.applicant_id}"
@@ -470,50 +459,32 @@ class TextService:
         )
 
         try:
-            # Initialize Azure OpenAI client
-            logger.debug(
-                "[TextService.interrupt_handler] Initializing Azure OpenAI client"
-            )
-            client = AzureOpenAI(
-                api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-                azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", ""),
-                azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
-                api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-            )
-
             # Prepare LLM schema for interrupt handling
-            llm_schema = {
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "ApplicantSchema",
-                    "schema": InterruptModel.model_json_schema(),
-                },
-            }
-            system_prompt = self.config["llm"]["interrupt_handler"]["prompt"]
+            llm_schema = INTERRUPT_SCHEMA
+            system_prompt = INTERRUPT_HANDLER_PROMPT
 
             # Get conversation history and current data
             logger.debug(
                 "[TextService.interrupt_handler] Fetching conversation context"
             )
-            conversation_repo = ConversationRepository(get_db())
-            conversation_service = ConversationService(conversation_repo)
-            history = conversation_service.get_history(
-                user_details, applicant_id=applicant.applicant_id
-            )
-            conversation_repo.close()
+            with session_scope() as db:
+                conversation_service = ConversationService(ConversationRepository(db))
+                history = conversation_service.get_history(
+                    user_details, applicant_id=applicant.applicant_id
+                )
+                latest_job = job_service.get_latest_job(applicant.applicant_id, db=db)
             history = [{"role": i.role, "content": i.content} for i in history]
             current_data = (
                 applicant.details.model_dump(exclude_none=True)
                 if applicant.details
                 else {}
             )
-            latest_job = job_service.get_latest_job(applicant.applicant_id)
 
             # Make AI completion request
             logger.debug(
                 "[TextService.interrupt_handler] Sending interrupt handling request to Azure OpenAI"
             )
-            completion = client.chat.completions.create(
+            completion = self.client.chat.completions.create(
                 model="gpt-4.1",
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -535,7 +506,7 @@ class TextService:
 
             # Parse response
             content = completion.choices[0].message.content or ""
-            data = InterruptModel.model_validate(json.loads(content))
+            data = InterruptModel.model_validate_json(content)
 
             # Create event for conversation tracking
             event = Event(
@@ -544,8 +515,6 @@ class TextService:
                 msg_type="text",
                 receiver_id=applicant.applicant_id,
                 sender_id=user_details.id,
-                timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                mid=shortuuid.uuid(),
             )
 
             # Send response message
@@ -667,8 +636,6 @@ class TextService:
                         msg_type="text",
                         receiver_id=event["sender_id"],
                         sender_id=event["receiver_id"],
-                        timestamp=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                        mid=shortuuid.uuid(),
                     )
                     logger.debug(
                         "[TextService.parse_event] Sending introduction message"
@@ -679,14 +646,13 @@ class TextService:
                         event=introduction_event,
                         key=key,
                     )
-                    applicant_repo = ApplicantsRepository(get_db())
-                    applicant_service = ApplicantService(applicant_repo)
-                    applicant_service.update_status(
-                        user_details=user_details,
-                        applicant_id=applicant.applicant_id,
-                        status=ApplicantStatus.INITIATED,
-                    )
-                    applicant_repo.close()
+                    with session_scope() as db:
+                        applicant_service = ApplicantService(ApplicantsRepository(db))
+                        applicant_service.update_status(
+                            user_details=user_details,
+                            applicant_id=applicant.applicant_id,
+                            status=ApplicantStatus.INITIATED,
+                        )
                 elif applicant.status in [
                     ApplicantStatus.INITIATED,
                     ApplicantStatus.DETAILS_IN_PROGRESS,
@@ -755,36 +721,31 @@ class TextService:
                 f"[TextService.parse_event] Processing message from applicant {applicant_id} to recruiter {recruiter_id}"
             )
 
-            # Get user details
-            logger.debug("[TextService.parse_event] Retrieving user details")
-            user_details = get_user_details(x_user_id=recruiter_id, db=get_db())
-
-            # Get applicant details
-            logger.debug("[TextService.parse_event] Retrieving applicant details")
-            applicant_repo = ApplicantsRepository(get_db())
-            applicant_service = ApplicantService(applicant_repo)
-            applicant = applicant_service.get_applicant_by_recruiter_and_applicant(
-                user_details, applicant_id=applicant_id
-            )
-            applicant_repo.close()
-
             user_event = Event(
                 chat_id=event["chat_id"],
                 content=event["content"],
                 msg_type=event["msg_type"],
                 receiver_id=event["receiver_id"],
                 sender_id=event["sender_id"],
-                timestamp=event.get(
-                    "timestamp", datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
-                ),
-                mid=event.get("mid", shortuuid.uuid()),
-            )
-            conversation_repo = ConversationRepository(get_db())
-            conversation_service = ConversationService(conversation_repo)
-            conversation_service.update_conversation(
-                user_details, applicant_id, user_event, role=Role.APPLICANT
-            )
-            conversation_repo.close()
+                timestamp=event.get("timestamp") or event_timestamp(),
+                mid=event.get("mid") or shortuuid.uuid(),
+            )
+            with session_scope() as db:
+                # Get user details
+                logger.debug("[TextService.parse_event] Retrieving user details")
+                user_details = get_user_details(x_user_id=recruiter_id, db=db)
+
+                # Get applicant details
+                logger.debug("[TextService.parse_event] Retrieving applicant details")
+                applicant_service = ApplicantService(ApplicantsRepository(db))
+                applicant = applicant_service.get_applicant_by_recruiter_and_applicant(
+                    user_details, applicant_id=applicant_id
+                )
+
+                conversation_service = ConversationService(ConversationRepository(db))
+                conversation_service.update_conversation(
+                    user_details, applicant_id, user_event, role=Role.APPLICANT
+                )
             logger.info(
                 f"[TextService.parse_event] Applicant status: {applicant.status}"
             )
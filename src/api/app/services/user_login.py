@@ -2,12 +2,15 @@ import hashlib
 from typing import List
 from datetime import datetime
 
+from pydantic import TypeAdapter
 from fastapi import HTTPException
 
 from app.repositories.user_login import Repository
 
 from app.models.user_login import Model, Role, UserDetails, Request, Response
 
+MODELS_ADAPTER = TypeAdapter(list[Model])
+
 
 class Service:
     def __init__(self, repo: Repository):
@@ -33,7 +36,7 @@ class Service:
             users = self.repo.get_all(str(user_details.id))
         if not users:
             raise HTTPException(status_code=404, detail="No users found")
-        return [Model.model_validate(user) for user in users]
+        return MODELS_ADAPTER.validate_python(users, from_attributes=True)
 
     def get_user_details(self, user_id: str) -> UserDetails:
         """
@@ -1,16 +1,16 @@
-import json
 from io import BytesIO
 from typing import List
 from datetime import datetime
 
 import pandas as pd
+from pydantic_core import to_json
 from kafka import KafkaProducer
 
 from app.core.config import config
 from app.core.logger import logger
 from app.core.exception import MyException, ErrorMessages
 
-from app.db.postgres import get_db
+from app.db.postgres import session_scope
 
 from app.models.utils import Event
 from app.models.applicants import Model
@@ -20,9 +20,15 @@ from app.repositories.applicants import Repository as ApplicantsRepository
 from app.repositories.conversations import Repository as ConversationRepository
 
 
+# send() only appends to the producer buffer; a background thread batches
+# records per partition (linger_ms/batch_size) and ships them to the broker
+# compressed.
 producer = KafkaProducer(
     bootstrap_servers=config["kafka"]["brokers"],
-    value_serializer=lambda x: json.dumps(x).encode("utf-8"),
+    value_serializer=to_json,
+    linger_ms=config["kafka"]["producer"]["linger_ms"],
+    batch_size=config["kafka"]["producer"]["batch_size"],
+    compression_type=config["kafka"]["producer"]["compression_type"],
 )
 
 
@@ -36,50 +42,73 @@ def send_message(
     Sends a response message to the Kafka output topic.
     :param response: The response message to be sent.
     """
+    send_messages(
+        user_details=user_details, applicant_id=applicant_id, events=[event], key=key
+    )
+
+
+def send_messages(
+    user_details: UserDetails,
+    applicant_id: int,
+    events: List[Event],
+    key: str,
+):
+    """
+    Sends consecutive response messages to the Kafka output topic, recording
+    them with one response update and one conversation append.
+    :param events: The response messages to be sent, in order.
+    """
     try:
         logger.info(
-            f"[send_message] Sending message: {event.model_dump()} with key: {key} to Kafka topic: {config['kafka']['output']['topic']}"
+            "[send_message] Sending %d message(s) with key: %s to Kafka topic: %s",
+            len(events),
+            key,
+            config["kafka"]["output"]["topic"],
         )
         from app.services.applicants import Service as ApplicantService
         from app.services.conversations import Service as ConversationService
 
-        applicant_repo = ApplicantsRepository(get_db())
-        applicant_service = ApplicantService(applicant_repo)
-        conversation_repo = ConversationRepository(get_db())
-        conversation_service = ConversationService(conversation_repo)
-        if event.content and (event.receiver_id != event.sender_id):
+        recorded = [
+            event
+            for event in events
+            if event.content and (event.receiver_id != event.sender_id)
+        ]
+        if recorded:
             logger.info(
                 f"[send_message] Updating response for applicant {applicant_id} by recruiter {user_details.id}"
             )
-            # Update response
-            applicant_service.update_response(
-                user_details=user_details,
-                applicant_id=applicant_id,
-                response=event.content,
+            with session_scope() as db:
+                # Update response
+                applicant_service = ApplicantService(ApplicantsRepository(db))
+                applicant_service.update_response(
+                    user_details=user_details,
+                    applicant_id=applicant_id,
+                    response=recorded[-1].content,  # type: ignore
+                    count=len(recorded),
+                )
+                logger.info(
+                    f"[send_message] Updated response for applicant {applicant_id} by recruiter {user_details.id}"
+                )
+                # update conversation
+                conversation_service = ConversationService(ConversationRepository(db))
+                conversation_service.update_conversations(
+                    user_details=user_details,
+                    applicant_id=applicant_id,
+                    events=recorded,
+                    role=Role.RECRUITER,
+                )
+        for event in events:
+            response_event = event.model_dump(exclude_none=True)
+            response_event["receiver_id"] = str(event.receiver_id)
+            response_event["sender_id"] = str(event.sender_id)
+            producer.send(
+                topic=config["kafka"]["output"]["topic"],
+                key=key.encode("utf-8"),
+                value=response_event,
             )
-            applicant_repo.close()
             logger.info(
-                f"[send_message] Updated response for applicant {applicant_id} by recruiter {user_details.id}"
-            )
-            # update conversation
-            conversation_service.update_conversation(
-                user_details=user_details,
-                applicant_id=applicant_id,
-                event=event,
-                role=Role.RECRUITER,
+                f"[send_message] Message {response_event} sent to Kafka topic: {config['kafka']['output']['topic']} with key: {key}"
             )
-            conversation_repo.close()
-        response_event = event.model_dump(exclude_none=True)
-        response_event["receiver_id"] = str(event.receiver_id)
-        response_event["sender_id"] = str(event.sender_id)
-        producer.send(
-            topic=config["kafka"]["output"]["topic"],
-            key=key.encode("utf-8"),
-            value=response_event,
-        )
-        logger.info(
-            f"[send_message] Message {response_event} sent to Kafka topic: {config['kafka']['output']['topic']} with key: {key}"
-        )
     except Exception as e:
         logger.error(f"[send_message] Error sending message to Kafka: {e}")
         raise MyException(
@@ -1,5 +1,6 @@
 from typing import List
 
+from pydantic import TypeAdapter
 from fastapi import HTTPException, status as http_status
 
 from app.repositories.whatsmeow_contacts import Repository
@@ -7,6 +8,8 @@ from app.repositories.whatsmeow_contacts import Repository
 from app.models.user_login import UserDetails
 from app.models.whatsmeow_contacts import Model
 
+MODELS_ADAPTER = TypeAdapter(list[Model])
+
 
 class Service:
     def __init__(self, repo: Repository):
@@ -18,5 +21,5 @@ class Service:
             raise HTTPException(
                 status_code=http_status.HTTP_404_NOT_FOUND, detail="No contacts found"
             )
-        data = [Model.model_validate(table) for table in tables]
+        data = MODELS_ADAPTER.validate_python(tables, from_attributes=True)
         return data
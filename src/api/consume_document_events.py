@@ -0,0 +1,5 @@
+from app.services.kafka_service import Service
+
+if __name__ == "__main__":
+    kafka_service = Service()
+    kafka_service.consume_document_messages()
@@ -3,6 +3,7 @@ from contextlib import asynccontextmanager
 
 from app.db.postgres import init_db
 from app.api.v1 import main_router as router
+from app.services.util_service import producer
 
 app = FastAPI()
 
@@ -11,6 +12,8 @@ app = FastAPI()
 async def lifespan(app: FastAPI):
     init_db()
     yield
+    # deliver any records still lingering in the producer buffer
+    producer.flush()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -18,12 +18,20 @@ echo "Starting background services..."
 uv run uvicorn main:app --host 0.0.0.0 --port 8000 --workers 4 --access-log --log-level info --timeout-keep-alive 5 &
 echo "Started fastapi main.py (PID: $!)"
 
-uv run consume_user_events.py &
-echo "Started consume_user_events.py (PID: $!)"
+# One candidate consumer per ingest partition; the consumer group spreads the
+# partitions across the processes, each keeping its chats' order
+CANDIDATE_CONSUMERS=${CANDIDATE_CONSUMERS:-4}
+for i in $(seq 1 "$CANDIDATE_CONSUMERS"); do
+    uv run consume_user_events.py &
+    echo "Started consume_user_events.py #$i (PID: $!)"
+done
 
 uv run consume_admin_events.py &
 echo "Started consume_admin_events.py (PID: $!)"
 
+uv run consume_document_events.py &
+echo "Started consume_document_events.py (PID: $!)"
+
 uv run consume_multiline_events.py &
 echo "Started consume_multiline_events.py (PID: $!)"
 